@@ -0,0 +1,66 @@
+"""
+Construction time and peak memory of a Bars instance with one
+Rectangle per bar (barh()) and with a single collection of bars
+(SEE the "bar_collection_threshold" configuration parameter), in
+function of the number of bars.
+
+Usage (from the repository root):
+
+    python benchmarks/bench_bar_collection.py [n_1 n_2 ...]
+
+Peak memory is measured with tracemalloc in a separate run.
+"""
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from catbars import Bars
+
+
+MODES = [('patches', None),
+         ('collection', 0)]
+
+
+def build(n, threshold):
+    rng = np.random.RandomState(0)
+    numbers = rng.rand(n) * 1000
+    colors = ['c{}'.format(i % 8) for i in range(n)]
+    # The figure height grows with the number of bars.
+    figsize = (6, max(5, n / 25))
+    bars = Bars(numbers,
+                colors = colors,
+                figsize = figsize,
+                bar_collection_threshold = threshold)
+    bars.to_bytes('png')
+
+
+def time_building(n, threshold, repeat = 3):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        build(n, threshold)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def peak_memory(n, threshold):
+    tracemalloc.start()
+    build(n, threshold)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+if __name__ == '__main__':
+    sizes = [int(n) for n in sys.argv[1:]] or [1000, 5000]
+    print('{:>8} {:>12} {:>12} {:>12}'.format('bars',
+                                             'mode',
+                                             'seconds',
+                                             'peak (MB)'))
+    for n in sizes:
+        for name, threshold in MODES:
+            t = time_building(n, threshold)
+            m = peak_memory(n, threshold) / 2**20
+            print('{:>8} {:>12} {:>12.3f} {:>12.1f}'.format(n, name, t, m))
@@ -0,0 +1,58 @@
+"""
+Building time and peak memory of a model in function of the number
+of rows. The chart itself only shows a slice of the data (global view).
+
+Usage (from the repository root):
+
+    python benchmarks/bench_models.py [n_1 n_2 ...]
+
+Peak memory is measured with tracemalloc, which slows down the
+building: timings and memory are measured in separate runs.
+"""
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from catbars.models import ModelFactory
+
+
+def build(numbers):
+    return ModelFactory(numbers,
+                        global_view = True,
+                        slice = (1, 30)).model
+
+
+def time_building(numbers, repeat = 3):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        build(numbers)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def peak_memory(numbers):
+    tracemalloc.start()
+    build(numbers)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+if __name__ == '__main__':
+    sizes = [int(n) for n in sys.argv[1:]] or [10**4, 10**6, 10**7]
+    print('{:>10} {:>8} {:>12} {:>12}'.format('rows',
+                                             'input',
+                                             'seconds',
+                                             'peak (MB)'))
+    for n in sizes:
+        array = np.random.RandomState(0).rand(n) * 1000
+        inputs = [('ndarray', array),
+                  ('Series', pd.Series(array))]
+        for name, numbers in inputs:
+            t = time_building(numbers)
+            m = peak_memory(numbers) / 2**20
+            print('{:>10} {:>8} {:>12.4f} {:>12.1f}'.format(n, name, t, m))
@@ -0,0 +1,42 @@
+"""
+Construction time of a Bars instance with right labels
+in function of the number of bars.
+
+Usage (from the repository root):
+
+    python benchmarks/bench_right_labels.py [n_1 n_2 ...]
+
+The cost is expected to grow linearly with the number of bars.
+"""
+import sys
+import time
+
+import numpy as np
+
+from catbars import Bars
+
+
+def time_construction(n, repeat = 3):
+    rng = np.random.RandomState(0)
+    numbers = rng.rand(n) * 1000
+    colors = ['c{}'.format(i % 8) for i in range(n)]
+    # The figure height grows with the number of bars.
+    figsize = (6, max(5, n / 25))
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        Bars(numbers,
+             right_labels = 'proportion',
+             left_labels = 'rank',
+             colors = colors,
+             figsize = figsize)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+if __name__ == '__main__':
+    sizes = [int(n) for n in sys.argv[1:]] or [10, 100, 1000, 5000]
+    print('{:>8} {:>12} {:>14}'.format('bars', 'seconds', 'ms per bar'))
+    for n in sizes:
+        t = time_construction(n)
+        print('{:>8} {:>12.3f} {:>14.3f}'.format(n, t, 1000 * t / n))
@@ -0,0 +1,47 @@
+"""
+Latency of the first chart of a process, without and with a call to
+catbars.warmup() (SEE catbars.bars.warmup()). Each measure runs in a
+fresh interpreter.
+
+Usage (from the repository root):
+
+    python benchmarks/bench_warmup.py [repeat]
+
+"""
+import subprocess
+import sys
+
+
+# Prints the latency of the first chart of the process.
+CODE = """
+import sys
+import time
+import catbars
+if sys.argv[1] == 'warm':
+    catbars.warmup({'data_font_size' : 9})
+start = time.perf_counter()
+catbars.Bars([5e6, 2e6, 3e5],
+             left_labels = ['Alpha', 'Beta', 'Gamma'],
+             right_labels = 'proportion',
+             colors = ['x', 'y', 'x'],
+             title = 'Title',
+             data_font_size = 9).to_bytes('png')
+print(time.perf_counter() - start)
+"""
+
+
+def first_render(mode):
+    result = subprocess.run([sys.executable, '-c', CODE, mode],
+                            capture_output = True,
+                            text = True,
+                            check = True)
+    return float(result.stdout)
+
+
+
+if __name__ == '__main__':
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    print('{:>6} {:>12}'.format('mode', 'seconds'))
+    for mode in ['cold', 'warm']:
+        seconds = min(first_render(mode) for _ in range(repeat))
+        print('{:>6} {:12.3f}'.format(mode, seconds))
@@ -0,0 +1,350 @@
+"""
+Benchmark suite: building time and peak memory of charts for
+synthetic datasets scaled from catbars.cac40.
+
+Each scenario combines "sort", "global_view", "slice", the
+"right_labels" mode, the legend and "auto_scale". Four phases are
+measured separately:
+
+- model: validation, sorting, slicing and coloring (ModelFactory),
+- layout: the figure construction, its layout and first drawing,
+- png and pdf: the encoding of the drawn figure.
+
+Timings are the minimum over "repeat" runs. Peak memory is measured
+with tracemalloc in an extra run (tracemalloc slows down the code).
+The duration of "import catbars" is measured in fresh interpreters
+(python -X importtime).
+Results are written as JSON and two result files can be compared.
+
+Usage (from the repository root, offline):
+
+    python benchmarks/suite.py run --rows 1000 100000 -o new.json
+    python benchmarks/suite.py compare old.json new.json
+
+Charts without a slice draw one bar per row: they are only built for
+datasets of at most --max-bars rows.
+"""
+import argparse
+from collections import Counter
+import itertools
+import json
+import math
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+
+import matplotlib
+import numpy as np
+
+from catbars import Bars
+from catbars import cac40
+from catbars.models import ModelFactory
+
+
+FORMAT_VERSION = 1
+
+
+PHASES = ['model', 'layout', 'png', 'pdf']
+
+
+# Scenario parameters and their values.
+AXES = [('sort', [False, True]),
+        ('global_view', [False, True]),
+        ('slice', [None, (1, 30)]),
+        ('right_labels', [None, 'proportion', 'names']),
+        ('legend_visible', [True, False]),
+        ('auto_scale', [False, True])]
+
+
+# One value per parameter is varied from this scenario (--quick).
+BASE_SCENARIO = {'sort' : True,
+                 'global_view' : True,
+                 'slice' : (1, 30),
+                 'right_labels' : 'proportion',
+                 'legend_visible' : True,
+                 'auto_scale' : False}
+
+
+
+def make_dataset(n,
+                 label_length = 12,
+                 categories = 10,
+                 seed = 0):
+    """
+    n rows shaped like catbars.cac40: log-normal market caps fitted
+    to the CAC 40 ones, company names of "label_length" characters
+    and "categories" industry sectors (the CAC 40 sectors first)
+    drawn with the CAC 40 frequencies.
+
+    Returns
+    --------
+    dict
+        'numbers' (ndarray), 'names' (list of str) and 'sectors'
+        (list of str).
+    """
+    rng = np.random.RandomState(seed)
+    caps = np.log([row[1] for row in cac40.data.values()])
+    numbers = np.exp(rng.normal(caps.mean(), caps.std(), n))
+
+    companies = list(cac40.data)
+    names = []
+    for i in range(n):
+        name = '{} {}'.format(companies[i % len(companies)], i)
+        names.append(name[:label_length].ljust(label_length, '.'))
+
+    counter = Counter(row[2] for row in cac40.data.values())
+    sector_names = [sector for sector, _ in counter.most_common()]
+    weights = [count for _, count in counter.most_common()]
+    for i in range(len(sector_names), categories):
+        sector_names.append('Sector {}'.format(i))
+        weights.append(1)
+    sector_names = sector_names[:categories]
+    weights = np.array(weights[:categories], dtype = float)
+    codes = rng.choice(categories, size = n, p = weights / weights.sum())
+    sectors = [sector_names[code] for code in codes.tolist()]
+
+    return {'numbers' : numbers,
+            'names' : names,
+            'sectors' : sectors}
+
+
+def get_scenarios(quick = False):
+    """
+    The cross product of AXES or, if "quick" is True, BASE_SCENARIO
+    and its variations along each axis.
+    """
+    names = [name for name, _ in AXES]
+    if not quick:
+        return [dict(zip(names, values)) for values
+                in itertools.product(*[values for _, values in AXES])]
+    scenarios = [dict(BASE_SCENARIO)]
+    for name, values in AXES:
+        for value in values:
+            if value != BASE_SCENARIO[name]:
+                scenarios.append(dict(BASE_SCENARIO, **{name : value}))
+    return scenarios
+
+
+def get_kwargs(dataset, scenario):
+    """
+    Keyword arguments of the Bars constructor (without "numbers").
+    """
+    right_labels = scenario['right_labels']
+    if right_labels == 'names':
+        right_labels = dataset['names']
+    kwargs = dict(scenario, right_labels = right_labels)
+    kwargs.update(left_labels = dataset['names'],
+                  colors = dataset['sectors'],
+                  title = 'Market capitalization',
+                  xlabel = 'euros')
+    return kwargs
+
+
+def run_phases(numbers, kwargs, phase_hook):
+    """
+    One chart built phase by phase. phase_hook(name) is called at the
+    end of each phase.
+    """
+    model_kwargs = {name : kwargs[name] for name in ['left_labels',
+                                                     'right_labels',
+                                                     'colors',
+                                                     'sort',
+                                                     'slice',
+                                                     'global_view']}
+    ModelFactory(numbers, **model_kwargs)
+    phase_hook('model')
+    bars = Bars(numbers, lazy = True, **kwargs)
+    # The model is built again: it isn't part of the layout phase.
+    phase_hook(None)
+    bars.fig
+    phase_hook('layout')
+    bars.to_bytes('png')
+    phase_hook('png')
+    bars.to_bytes('pdf')
+    phase_hook('pdf')
+
+
+def measure(numbers, kwargs, repeat = 3):
+    """
+    {phase : {'seconds' : float, 'peak_bytes' : int}}
+    """
+    seconds = {phase : math.inf for phase in PHASES}
+    for _ in range(repeat):
+        start = time.perf_counter()
+        def hook(phase):
+            nonlocal start
+            end = time.perf_counter()
+            if phase is not None:
+                seconds[phase] = min(seconds[phase], end - start)
+            start = time.perf_counter()
+        run_phases(numbers, kwargs, hook)
+
+    peaks = dict()
+    tracemalloc.start()
+    try:
+        def hook(phase):
+            if phase is not None:
+                _, peaks[phase] = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+        run_phases(numbers, kwargs, hook)
+    finally:
+        tracemalloc.stop()
+
+    return {phase : {'seconds' : seconds[phase],
+                     'peak_bytes' : peaks[phase]} for phase in PHASES}
+
+
+def measure_import(repeat = 3):
+    """
+    Cumulative "import catbars" time in seconds (minimum over "repeat"
+    fresh interpreters).
+    """
+    seconds = math.inf
+    for _ in range(repeat):
+        stderr = subprocess.run([sys.executable,
+                                 '-X', 'importtime',
+                                 '-c', 'import catbars'],
+                                capture_output = True,
+                                text = True,
+                                check = True).stderr
+        # "import time: self [us] | cumulative | module"
+        for line in stderr.splitlines():
+            if line.startswith('import time:') and '|' in line:
+                _, cumulative, name = line.split('|')
+                if name.strip() == 'catbars':
+                    seconds = min(seconds, int(cumulative) / 1e6)
+    return seconds
+
+
+def get_environment(label):
+    try:
+        commit = subprocess.run(['git', 'rev-parse', 'HEAD'],
+                                capture_output = True,
+                                text = True,
+                                check = True).stdout.strip()
+    except Exception:
+        commit = None
+    return {'label' : label,
+            'commit' : commit,
+            'python' : platform.python_version(),
+            'platform' : platform.platform(),
+            'matplotlib' : matplotlib.__version__,
+            'numpy' : np.__version__,
+            'time' : time.strftime('%Y-%m-%dT%H:%M:%S')}
+
+
+def scenario_key(rows, scenario):
+    """
+    Identifies a result across files.
+    """
+    return json.dumps({'rows' : rows, **scenario}, sort_keys = True)
+
+
+def run(args):
+    results = []
+    scenarios = get_scenarios(args.quick)
+    for rows in args.rows:
+        dataset = make_dataset(rows,
+                               label_length = args.label_length,
+                               categories = args.categories)
+        for scenario in scenarios:
+            if scenario['slice'] is None and rows > args.max_bars:
+                continue
+            kwargs = get_kwargs(dataset, scenario)
+            phases = measure(dataset['numbers'], kwargs, args.repeat)
+            results.append({'rows' : rows,
+                            'scenario' : scenario,
+                            'phases' : phases})
+            total = sum(phase['seconds'] for phase in phases.values())
+            print('{:>9} {:8.3f} s  {}'.format(rows,
+                                               total,
+                                               json.dumps(scenario)),
+                  file = sys.stderr)
+    report = {'format_version' : FORMAT_VERSION,
+              'environment' : get_environment(args.label),
+              'parameters' : {'label_length' : args.label_length,
+                              'categories' : args.categories,
+                              'repeat' : args.repeat},
+              'import' : {'seconds' : measure_import(args.repeat)},
+              'results' : results}
+    if args.output is None:
+        json.dump(report, sys.stdout, indent = 1)
+    else:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent = 1)
+
+
+def compare(args):
+    """
+    Ratios new / old of the timings and peak memory of the common
+    results. Ratios above the threshold are flagged as regressions.
+    """
+    reports = []
+    for file_name in [args.old, args.new]:
+        with open(file_name) as f:
+            reports.append(json.load(f))
+    old, new = [{scenario_key(r['rows'], r['scenario']) : r['phases']
+                 for r in report['results']} for report in reports]
+    regressions = 0
+    for key in [key for key in new if key in old]:
+        ratios = []
+        for phase in PHASES:
+            for measure_name in ['seconds', 'peak_bytes']:
+                a = old[key][phase][measure_name]
+                b = new[key][phase][measure_name]
+                ratio = b / a if a > 0 else math.inf
+                flag = ''
+                if ratio > args.threshold:
+                    flag = '!'
+                    regressions += 1
+                ratios.append('{} {} {:.2f}{}'.format(phase,
+                                                      measure_name[0],
+                                                      ratio,
+                                                      flag))
+        print(key)
+        print('    ' + '  '.join(ratios))
+    if 'import' in reports[0] and 'import' in reports[1]:
+        a, b = [report['import']['seconds'] for report in reports]
+        ratio = b / a if a > 0 else math.inf
+        flag = ''
+        if ratio > args.threshold:
+            flag = '!'
+            regressions += 1
+        print('import catbars')
+        print('    s {:.2f}{}'.format(ratio, flag))
+    print('{} regression(s) above {}'.format(regressions, args.threshold))
+    return 1 if regressions else 0
+
+
+def main(argv = None):
+    parser = argparse.ArgumentParser(description = __doc__.split('\n')[1])
+    subparsers = parser.add_subparsers(dest = 'command', required = True)
+
+    p = subparsers.add_parser('run', help = 'run the benchmarks')
+    p.add_argument('--rows', type = int, nargs = '+',
+                   default = [40, 1000, 100000])
+    p.add_argument('--label-length', type = int, default = 12)
+    p.add_argument('--categories', type = int, default = 10)
+    p.add_argument('--repeat', type = int, default = 3)
+    p.add_argument('--max-bars', type = int, default = 1000)
+    p.add_argument('--quick', action = 'store_true',
+                   help = 'vary one parameter at a time')
+    p.add_argument('--label', help = 'a name for this run (version)')
+    p.add_argument('-o', '--output', help = 'JSON file (default: stdout)')
+
+    p = subparsers.add_parser('compare', help = 'compare two JSON files')
+    p.add_argument('old')
+    p.add_argument('new')
+    p.add_argument('--threshold', type = float, default = 1.2)
+
+    args = parser.parse_args(argv)
+    if args.command == 'run':
+        run(args)
+        return 0
+    return compare(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,2 +1,62 @@
+"""
+Catbars: horizontal bar charts.
 
-from .bars import Bars
+Importing catbars is cheap: Bars, warmup() and render_many() are
+imported on first access (PEP 562) and Matplotlib is imported when
+the first figure is built (SEE warmup()). pandas isn't imported: the
+pandas accessor (SEE catbars.accessors) is registered if pandas has
+been imported before catbars or before the first access to Bars,
+warmup() or render_many(). Otherwise, it is registered by:
+
+    import catbars.accessors
+"""
+import importlib
+import sys
+
+from .extents import text_extent_cache
+from .layouts import layout_cache
+from .instrumentation import hooks
+
+
+# Attributes to the submodules defining them.
+_LAZY_ATTRIBUTES = {'Bars' : 'bars',
+                    'warmup' : 'bars',
+                    'render_many' : 'batch'}
+
+
+__all__ = ['Bars',
+           'warmup',
+           'text_extent_cache',
+           'layout_cache',
+           'render_many',
+           'hooks']
+
+
+def __getattr__(name):
+    if name in _LAZY_ATTRIBUTES:
+        _register_accessor()
+        module = importlib.import_module('.' + _LAZY_ATTRIBUTES[name],
+                                         __name__)
+        value = getattr(module, name)
+        globals()[name] = value
+        return value
+    raise AttributeError(
+        'module {!r} has no attribute {!r}'.format(__name__, name))
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
+
+
+
+def _register_accessor():
+    """
+    The pandas accessor is registered if pandas is imported.
+    """
+    if ('pandas' in sys.modules and
+        'catbars.accessors' not in sys.modules):
+        #
+        from . import accessors
+
+
+_register_accessor()
@@ -0,0 +1,44 @@
+"""
+pandas accessor:
+
+    df.catbars.barh(numbers = 'cap',
+                    right_labels = 'name',
+                    colors = 'sector')
+
+It is registered when this module is imported, if pandas is
+installed. "import catbars" doesn't import pandas (pandas is slow to
+import): it imports this module only if pandas has been imported
+before catbars or before the first access to catbars.Bars. In any
+order, the accessor is registered by:
+
+    import catbars.accessors
+
+"""
+try:
+    import pandas as pd
+except ImportError:
+    pd = None
+
+
+class CatbarsAccessor:
+    """
+    The "catbars" namespace of DataFrame instances.
+    """
+
+    def __init__(self, df):
+        self._df = df
+
+
+    def barh(self, numbers, **kwargs):
+        """
+        SEE Bars.from_frame().
+        """
+        from .bars import Bars
+
+        return Bars.from_frame(self._df, numbers, **kwargs)
+
+
+
+if pd is not None:
+    pd.api.extensions.register_dataframe_accessor('catbars')(
+        CatbarsAccessor)
@@ -1,21 +1,52 @@
-from matplotlib.figure import Figure
-from matplotlib.axes import Axes
-from matplotlib.backends.backend_agg import FigureCanvasAgg
-import matplotlib.patches as mpatches
-import matplotlib.text
-import matplotlib.ticker
-
+# Matplotlib modules are imported by the methods using them: they
+# are only loaded when the first figure is built (SEE _build_figure()).
 import numpy as np
 
 from functools import partial
 import logging
+import math
 from io import BytesIO
+import hashlib
+import threading
+import os
 import pprint
+import string
+
+from .models import ModelFactory, GlobalViewModel
+from .models import CHUNK_SIZE
+from .columns import get_column, has_column
+from .streams import read_rows, read_csv_header, iter_csv
+
+from .extents import text_extent_cache, text_key, legend_key
 
-from .models import ModelFactory
+from .layouts import layout_cache, validate_layout_template
 
 from .conf import Conf
 
+from .instrumentation import hooks, timed, COUNTS
+
+
+logger = logging.getLogger(__name__)
+
+
+# Matplotlib is not thread-safe: the mathtext parser is shared,
+# for instance. Figure work is serialized.
+_mpl_lock = threading.RLock()
+
+
+def _reset_mpl_lock():
+    """
+    A process forked while another thread holds the lock would inherit
+    it locked: the child gets a new lock.
+    """
+    global _mpl_lock
+    _mpl_lock = threading.RLock()
+
+
+if hasattr(os, 'register_at_fork'): # Not on Windows.
+    os.register_at_fork(after_in_child = _reset_mpl_lock)
+
+
 
 class Bars:
     """This class represents a complex horizontal bar chart.
@@ -27,8 +58,9 @@ class Bars:
     The chart can be tailored to a great extent by passing keyword
     arguments to the constructor. (SEE the class attribute **Bars.conf**
     for listing the other optional **kwargs**).
-    If it is not enough, the **conf.py** module in the Catbars package
-    gives users full control over "rcParams".
+    Other settings are read from the Matplotlib "rcParams", which Catbars
+    never modifies. Hence, charts can be built concurrently in several
+    threads.
 
     Parameters
     -----------    
@@ -36,6 +68,11 @@ class Bars:
     numbers : iterable container
         The numbers specifying the width of each bar. First numbers are
         converted into bars appearing on the top of the figure.
+        NumPy arrays and pandas Series of floats are used without
+        being copied. Numbers have to be non-negative and can't be NaN
+        (ValueError). Versions up to 1.0.1 accepted NaN numbers (their
+        bars weren't drawn): missing values have to be dropped or
+        filled first.
 
     left_labels : iterable container or str, optional
         Labels associated with the bars on the left.
@@ -110,6 +147,38 @@ class Bars:
         The path of the png file to write to. (SEE the method print_pdf()
         for writing pdf files).
 
+    layout_template : dict, optional
+        A layout returned by get_layout_template() for a chart with
+        the same configuration, titles, left labels and legend. The
+        corresponding constraint solving is skipped (SEE
+        catbars.layouts).
+
+    lazy : bool, optional
+        If True, the constructor only validates the arguments and builds
+        the model. The figure is built and laid out on first access to
+        "fig", "ax" or "canvas" (print_png(), print_pdf() and the
+        notebook rendering access them). The default value is False.
+
+    summary : catbars.streams.StreamSummary, optional
+        For a global view, statistics of a dataset whose first rows
+        are the given features (SEE from_iterable()).
+
+    overview : bool or str, optional
+        If True or 'max', 'mean' or 'sum', the whole sorted dataset
+        is shown: consecutive rows are aggregated into one bar per
+        pixel row of the axes (their maximum by default) colored by
+        their most common "colors" item. Rendering time then depends
+        on the figure height, not on the number of rows. "sort" has
+        to be True, "slice" and "right_labels" can't be used and
+        "left_labels" can't be 'proportion' (ValueError).
+        The default value is False.
+
+    anchors : iterable of int, optional
+        With "overview", the one-based ranks whose bars are labeled
+        (1, 10, 100, etc. by default). The labels are the ranks (if
+        "left_labels" is None or 'rank') or the "left_labels" items of
+        these rows.
+
     Returns
     --------
     catbars.bars.Bars
@@ -125,10 +194,25 @@ class Bars:
         In particular, it contains the "fig_size", "dpi",  "tints",
         "default_color" and "default_label" values.
     fig : matplotlib.figure.Figure
+        Built on first access if "lazy" is True.
     ax : matplotlib.axes.Axes
+        Built on first access if "lazy" is True.
     canvas : matplotlib.backends.backend_agg.FigureCanvasAgg
+        Built on first access if "lazy" is True.
     data : catbars.models.AbstractModel
         The Bars class delegates to another class data processing tasks.
+    bars : matplotlib.container.BarContainer or PolyCollection
+        The bar artists: a BarContainer of Rectangle patches, or a
+        single matplotlib.collections.PolyCollection in overview mode
+        and when the "bar_collection_threshold" configuration
+        parameter is set and reached.
+    timings : dict
+        Wall times of the phases of the construction in seconds, if
+        the "instrumented" configuration parameter is True or a hook
+        is registered (SEE catbars.instrumentation).
+    counts : dict
+        The numbers of figure drawings and text measurements of an
+        instrumented chart.
 
     Methods
     -------
@@ -136,6 +220,14 @@ class Bars:
         To write png files.
     print_pdf(file_name)
         To write pdf files.
+    to_bytes(format)
+        The encoded chart. Encoded outputs are cached.
+    from_frame(data, numbers, ...)
+        Alternative constructor reading columns of a DataFrame.
+    from_iterable(rows, ...), from_csv(file_name, ...)
+        Alternative constructors streaming rows.
+    paginate(numbers, ..., page_size)
+        Generator of the pages of a ranking.
 
     
 
@@ -160,6 +252,13 @@ class Bars:
                  legend_title = None,
                  legend_visible = True,
                  file_name = None,
+                 layout_template = None,
+                 lazy = False,
+                 summary = None,
+                 overview = False,
+                 anchors = None,
+                 *,
+                 _model = None,
                  **kwargs):
         """
         The data space can adapt to long labels but only to
@@ -175,20 +274,31 @@ class Bars:
         # Configuration: matplotlibrc is decorated by conf.py.
         self.conf = Conf.change_conf(kwargs)
         
+        # Instrumentation (SEE catbars.instrumentation).
+        self._instrumented = (self.conf['instrumented'] is True or
+                              len(hooks) > 0)
+        self.timings = dict()
+        self.counts = dict.fromkeys(COUNTS, 0)
+        
         # Data formatted by the model.
         self.data = None
         
         
-        # Core Matplotlib objects.
-        self.fig = None
-        self.ax = None
-        self.canvas = None
+        # Core Matplotlib objects (SEE the properties).
+        self._fig = None
+        self._ax = None
+        self._canvas = None
+        self._pending_build = None # Arguments of _build_figure().
+        self._encoded_outputs = dict() # SEE to_bytes().
+        self._encoding = False
+        self._canvas_is_current = False # The Agg buffer is up to date.
         self.vertical_line = None
-        self.bars = None # BarContainer.
+        self.bars = None # BarContainer or PolyCollection.
         self._virtual_bars  = None # For global_view.
 
         # Helper attributes.
         self._left_label_data = None
+        self._layout_template = None
         self._right_label_texts = None
         
         # Titles.
@@ -198,6 +308,7 @@ class Bars:
         self.legend_title = legend_title
         
         self._global_view = global_view
+        self._overview = overview
         self.legend = None
         self._legend_width = 0
         self.legend_visible = legend_visible
@@ -225,31 +336,340 @@ class Bars:
         #########################################################
 
         # Model.
-        factory = ModelFactory(
-            numbers,
+        self._model_kwargs = self._get_model_kwargs(
+            self.conf,
             global_view = global_view,
             left_labels = left_labels,
             right_labels = right_labels,
             colors = colors,
             sort = sort,
             slice = slice,
-            default_label = self.conf['default_label'],
             color_dic = color_dic,
-            tints = self.conf['tints'],
-            default_color = self.conf['default_color'])
+            summary = summary)
+        if overview is not False:
+            self._model_kwargs.update(
+                overview = 'max' if overview is True else overview,
+                bins = self._get_overview_bins(),
+                anchors = anchors,
+                # Anchor labels don't overlap (one bar per pixel).
+                anchor_gap = math.ceil(self.conf['data_font_size'] *
+                                       self.conf['dpi'] / 72))
+        if _model is None:
+            self.data = self._build_model(numbers, self._model_kwargs)
+        else:
+            # A page built by paginate() from "numbers".
+            self.data = _model
+        self._notify('model')
+                        
+        
+        if line_dic is not None:
+            self._set_line(line_dic)
+        
+        if layout_template is not None:
+            validate_layout_template(layout_template)
+        
+        self._auto_scale = auto_scale
+        self._pending_build = (auto_scale,
+                               layout_template)
+        
+        if lazy is False:
+            self._ensure_figure()
+        
+        # Printing.
+        if file_name is not None:
+            self.print_png(file_name)
         
 
-
-        self.data = factory.model
-                        
         
-        self.fig = Figure(figsize = self.conf['figsize'],
-                          dpi = self.conf['dpi'])
+        #############################################################
+        
+    
+    @classmethod
+    def from_frame(cls,
+                   data,
+                   numbers,
+                   left_labels = None,
+                   right_labels = None,
+                   colors = None,
+                   **kwargs):
+        """
+        Alternative constructor reading the features from the columns
+        of a table (SEE catbars.columns). Columns are read without
+        copying and categorical columns are read as codes.
+
+        Parameters
+        -----------
+        data : pandas.DataFrame, mapping or structured array
+            A mapping of column names to arrays or Series, or an object
+            supporting the buffer protocol with named fields.
+
+        numbers : str
+            The name of the "numbers" column.
+
+        left_labels, right_labels, colors : str, optional
+            Column names. The str options of the Bars constructor
+            ('rank' and 'proportion') can be used if there is no column
+            with that name.
+
+        **kwargs
+            The other arguments of the Bars constructor.
+
+        Returns
+        --------
+        catbars.bars.Bars
+        """
+        features = dict(left_labels = left_labels,
+                        right_labels = right_labels,
+                        colors = colors)
+        for name, value in features.items():
+            if has_column(data, value):
+                features[name] = get_column(data, value)
+        return cls(get_column(data, numbers),
+                   **features,
+                   **kwargs)
+
+
+    @classmethod
+    def from_iterable(cls,
+                      rows,
+                      numbers = 0,
+                      left_labels = None,
+                      right_labels = None,
+                      colors = None,
+                      chunk_size = CHUNK_SIZE,
+                      **kwargs):
+        """
+        Alternative constructor reading the rows of a dataset chunk
+        by chunk (SEE catbars.streams). With a slice, memory doesn't
+        depend on the number of rows.
+
+        Parameters
+        -----------
+        rows : iterable
+            Sequences or mappings, for instance the rows of a csv
+            reader or a generator.
+
+        numbers : int or str, optional
+            The key of the numbers in each row (0 by default).
+
+        left_labels, right_labels, colors : int or str, optional
+            Keys in each row. 'rank' and 'proportion' are the str
+            options of the Bars constructor.
+
+        chunk_size : int, optional
+            The number of rows processed at a time.
+
+        **kwargs
+            The other arguments of the Bars constructor.
+
+        Returns
+        --------
+        catbars.bars.Bars
+        """
+        columns = {'numbers' : numbers}
+        options = dict()
+        for name, value in [('left_labels', left_labels),
+                            ('right_labels', right_labels),
+                            ('colors', colors)]:
+            if value is None or value in ['rank', 'proportion']:
+                options[name] = value
+            else:
+                columns[name] = value
+        return cls._from_rows(rows, columns, options, chunk_size, kwargs)
+
+
+    @classmethod
+    def from_csv(cls,
+                 file_name,
+                 numbers,
+                 left_labels = None,
+                 right_labels = None,
+                 colors = None,
+                 delimiter = ',',
+                 chunk_size = CHUNK_SIZE,
+                 **kwargs):
+        """
+        Alternative constructor streaming a csv file with a header
+        (SEE from_iterable()). "numbers", "left_labels", "right_labels"
+        and "colors" are column names. Column names take precedence
+        over the 'rank' and 'proportion' options.
+        """
+        header = read_csv_header(file_name, delimiter)
+        columns = {'numbers' : numbers}
+        options = dict()
+        for name, value in [('left_labels', left_labels),
+                            ('right_labels', right_labels),
+                            ('colors', colors)]:
+            if value in header:
+                columns[name] = value
+            else:
+                options[name] = value
+        return cls._from_rows(iter_csv(file_name, delimiter),
+                              columns,
+                              options,
+                              chunk_size,
+                              kwargs)
+
+
+    @classmethod
+    def _from_rows(cls, rows, columns, options, chunk_size, kwargs):
+        features, summary = read_rows(
+            rows,
+            columns,
+            sort = kwargs.get('sort', False),
+            slice = kwargs.get('slice'),
+            global_view = kwargs.get('global_view', False),
+            chunk_size = chunk_size)
+        return cls(**features,
+                   **options,
+                   summary = summary,
+                   **kwargs)
+
+
+    @classmethod
+    def paginate(cls,
+                 numbers,
+                 left_labels = None,
+                 right_labels = None,
+                 colors = None,
+                 page_size = 30,
+                 reuse = False,
+                 **kwargs):
+        """
+        Generator of the pages of a ranking: the global views of the
+        slices (1, page_size), (page_size + 1, 2 * page_size), etc.
+        The dataset is validated and sorted once and the global
+        bounds and the color dictionary are shared by the pages.
+
+        Each page is a new Bars instance built from its rows of the
+        shared model.
+
+        Parameters
+        -----------
+        numbers, left_labels, right_labels, colors
+            SEE the Bars constructor.
+
+        page_size : int, optional
+            The number of bars per page (30 by default). The last page
+            may be shorter.
+
+        reuse : bool, optional
+            If True, the same Bars instance is yielded for every page:
+            its figure is updated in place (SEE update()), which is
+            faster. A page then has to be used, for instance printed,
+            before the next one is requested, and references to
+            earlier pages must not be kept. The default value is
+            False.
+
+        **kwargs
+            The other arguments of the Bars constructor except
+            "slice", "global_view", "file_name" and "overview". "sort"
+            is True by default.
+
+        Yields
+        -------
+        catbars.bars.Bars
+        """
+        for name in ['slice', 'global_view', 'file_name', 'overview']:
+            if name in kwargs:
+                text = """
+"{}" can't be passed to paginate().
+""".format(name)
+                raise TypeError(text.strip())
+        if not isinstance(page_size, int) or page_size < 1:
+            raise ValueError('"page_size" has to be a positive integer.')
+        kwargs.setdefault('sort', True)
+        features = dict(left_labels = left_labels,
+                        right_labels = right_labels,
+                        colors = colors)
+
+        model_kwargs = cls._get_model_kwargs(
+            Conf.change_conf(kwargs),
+            **features,
+            sort = kwargs['sort'],
+            slice = None,
+            color_dic = kwargs.get('color_dic'),
+            summary = kwargs.get('summary'))
+        data = GlobalViewModel(numbers, **model_kwargs)
+        bars = None
+        for page in data.pages(page_size):
+            if bars is None or reuse is False:
+                bars = cls(numbers,
+                           **features,
+                           slice = page._slice,
+                           global_view = True,
+                           _model = page,
+                           **kwargs)
+            else:
+                bars._model_kwargs['slice'] = page._slice
+                bars._set_data(page)
+            yield bars
+
+
+    @staticmethod
+    def _get_model_kwargs(conf, **kwargs):
+        """
+        Keyword arguments of ModelFactory: "kwargs" and the model
+        parameters of the configuration.
+        """
+        return dict(kwargs,
+                    default_label = conf['default_label'],
+                    tints = conf['tints'],
+                    default_color = conf['default_color'])
+
+
+    @property
+    def fig(self):
+        self._ensure_figure()
+        return self._fig
+
+
+    @property
+    def ax(self):
+        self._ensure_figure()
+        return self._ax
+
+
+    @property
+    def canvas(self):
+        self._ensure_figure()
+        return self._canvas
+
+
+    def _ensure_figure(self):
+        """
+        The figure is built once (SEE the "lazy" option).
+        """
+        if self._pending_build is None:
+            return
+        with _mpl_lock:
+            if self._pending_build is not None:
+                args = self._pending_build
+                self._pending_build = None
+                self._build_figure(*args)
+                self._notify('figure')
+
+
+    @timed('figure')
+    def _build_figure(self,
+                      auto_scale,
+                      layout_template):
+        """
+        Matplotlib objects, layout and first drawing.
+        """
+        from matplotlib.figure import Figure
+        from matplotlib.axes import Axes
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        import matplotlib.ticker
+
+        self._fig = Figure(figsize = self.conf['figsize'],
+                           dpi = self.conf['dpi'])
         
-        self.canvas = FigureCanvasAgg(self.fig)
+        self._canvas = FigureCanvasAgg(self.fig)
+        self._canvas.mpl_connect('draw_event', self._on_draw)
         
         
-        self.ax = Axes(self.fig,
+        self._ax = Axes(self.fig,
                        [self._x0,
                         self._y0,
                         self._width,
@@ -257,25 +677,22 @@ class Bars:
         
         
         self.fig.add_axes(self.ax)
-        self.canvas.draw()
        
         w, h = self.fig.get_size_inches()
         self._x_coeff = h / w
         
-        # margin.
-        margin = self.conf['margin']
-        
-        self._x0 = self._x_coeff * margin
-        self._y0 = margin
-        self._width = self._width - 2 * self._x_coeff * margin
-        self._height = self._height - 2 * margin
-        
-        self._set_position()
+        self._set_margins()
 
                 
         self.ax.tick_params(axis = 'y',
                             length = 0)
         
+        # Fonts are sized explicitly: rcParams are left untouched.
+        self.ax.tick_params(axis = 'both',
+                            labelsize = self.conf['data_font_size'])
+        self.ax.xaxis.get_offset_text().set_fontsize(
+            self.conf['data_font_size'])
+        
         self.ax.grid(b = True,
                      axis = 'x',
                      which = 'both',
@@ -289,10 +706,13 @@ class Bars:
         # xscale.
         if auto_scale is True:
             # To improve clarity.
-            if self.data.spread > 1 or self.data.maximum > 1e6:
+            if self._get_xscale() == 'log':
                 self.ax.set(xscale = 'log')
         else:
             default_formatter = self.ax.get_xaxis().get_major_formatter()
+            # The wrapped formatter needs a tick format even if
+            # the figure has not been drawn yet.
+            default_formatter.set_locs(self.ax.get_xticks())
             custom_formatter = self.build_formatter(default_formatter)
             formatter = matplotlib.ticker.FuncFormatter(custom_formatter)
             self.ax.get_xaxis().set_major_formatter(formatter)
@@ -300,7 +720,7 @@ class Bars:
         
         # Title.
         if self.title is not None:
-            self._manage_title()
+            self._draw_title()
 
         
         _kwargs = dict()
@@ -318,13 +738,27 @@ class Bars:
             _kwargs['color'] = self.data.default_color
 
         # bars.
-        self.bars = self.ax.barh(list(range(self.data.length)),
-                                 self.data.numbers,
-                                 height = 1,
-                                 edgecolor = 'white',
-                                 linewidth = 1, # 0.4
-                                 alpha = self.conf['color_alpha'],
-                                 **_kwargs)
+        if self._overview is not False:
+            # Bars are about one pixel high: they have no edges.
+            self.bars = self._draw_bar_collection(_kwargs['color'],
+                                                  linewidth = 0)
+            positions, texts = zip(*self.data.anchors)
+            self.ax.set_yticks(positions,
+                               labels = texts)
+        elif self._draws_bar_collection():
+            self.bars = self._draw_bar_collection(_kwargs['color'])
+            self.ax.set_yticks(range(self.data.length),
+                               labels = np.broadcast_to(
+                                   _kwargs['tick_label'],
+                                   self.data.length))
+        else:
+            self.bars = self.ax.barh(list(range(self.data.length)),
+                                     self.data.numbers,
+                                     height = 1,
+                                     edgecolor = 'white',
+                                     linewidth = 1, # 0.4
+                                     alpha = self.conf['color_alpha'],
+                                     **_kwargs)
 
         # To fix x bounds, virtual bars are used.
         if self._global_view is True:
@@ -340,27 +774,13 @@ class Bars:
 
         
         # The vertical line.
-        if line_dic is not None:
-            self._set_line(line_dic)
+        if self._line_is_visible():
+            self._draw_vertical_line()
         
-            if (self.line_x is not None and
-                self.data.minimum <= self.line_x <= self.data.maximum):
-                #
-                self.vertical_line = self.ax.axvline(
-                    self.line_x,
-                    ymin = 0,
-                    ymax = 1,
-                    color = self.line_color,
-                    linewidth = 2,
-                    alpha = self.conf['color_alpha'])
-        
-
-        # Left label constraint solving.
-        self._make_room_for_left_labels()
 
         # ylabel.
         if self.ylabel is not None:
-            self._manage_ylabel()
+            self._draw_ylabel()
         
         
         # Legend.
@@ -368,12 +788,117 @@ class Bars:
             self.data.colors is not None):
             #
             self._draw_legend()
-            self._make_room_for_legend()
+        
+        
+        # Title, left label, ylabel and legend constraint solving.
+        self._manage_layout(layout_template)
         
         
         # Right labels.
         if self.data.right_labels is not None:
             self._draw_right_labels()            
+        
+        # Right label, x tick label and xlabel constraint solving.
+        self._solve_data_layout()
+        
+        self._draw_canvas()
+
+
+    def _draws_bar_collection(self):
+        threshold = self.conf['bar_collection_threshold']
+        return threshold is not None and self.data.length >= threshold
+
+
+    def _get_overview_bins(self):
+        """
+        The number of pixel rows of the axes before the layout is
+        solved (an upper bound).
+        """
+        _, height = self.conf['figsize']
+        return max(1, int(height *
+                          self.conf['dpi'] *
+                          (1 - 2 * self.conf['margin'])))
+
+
+    def _draw_bar_collection(self,
+                             color,
+                             linewidth = 1):
+        """
+        High-cardinality mode: the bars are drawn as one
+        PolyCollection instead of one Rectangle per bar. The axes
+        limits are set as barh() sets them (the caller sets the y
+        ticks). The output only differs from barh() by antialiasing
+        at the ends of some bars.
+        """
+        from matplotlib.collections import PolyCollection
+
+        collection = PolyCollection(
+            self._get_bar_vertices(self.data.numbers),
+            closed = True,
+            facecolors = color,
+            edgecolors = 'white',
+            linewidths = linewidth,
+            alpha = self.conf['color_alpha'])
+        # The x axis starts at 0 (SEE barh()).
+        collection.sticky_edges.x.append(0)
+        self.ax.add_collection(collection)
+        self.ax.autoscale_view()
+        return collection
+
+
+    def _get_bar_vertices(self, numbers):
+        """
+        The corners of the bars of height 1 centered on 0, 1, 2, etc.
+        in data coordinates, as an (n, 4, 2) array. They are in the
+        order of the path of a Rectangle.
+        """
+        numbers = np.asarray(numbers, dtype = float)
+        bottoms = np.arange(len(numbers)) - 0.5
+        vertices = np.zeros((len(numbers), 4, 2))
+        vertices[:, 1:3, 0] = numbers[:, None]
+        vertices[:, 0:2, 1] = bottoms[:, None]
+        vertices[:, 2:4, 1] = (bottoms + 1)[:, None]
+        return vertices
+
+
+    @timed('model')
+    def _build_model(self, numbers, model_kwargs):
+        return ModelFactory(numbers, **model_kwargs).model
+
+
+    @timed('draw')
+    def _draw_canvas(self):
+        self.canvas.draw()
+
+
+    def _notify(self, event):
+        """
+        The registered hooks are called if the chart is instrumented
+        (SEE catbars.instrumentation).
+        """
+        if self._instrumented:
+            hooks.notify(self, event)
+
+
+    def _set_margins(self):
+        """
+        Original position of the axes edges in the figure.
+        """
+        margin = self.conf['margin']
+        
+        self._x0 = self._x_coeff * margin
+        self._y0 = margin
+        self._width = 1 - 2 * self._x_coeff * margin
+        self._height = 1 - 2 * margin
+        
+        self._set_position()
+
+
+    def _solve_data_layout(self):
+        """
+        Constraint solving for the components depending on "numbers".
+        """
+        if self.data.right_labels is not None:
             self._make_room_for_right_labels()
         
         
@@ -388,18 +913,22 @@ class Bars:
             self._height = self._height - delta_y0
             self._set_position()
 
-        
-        self.canvas.draw()
-        
-        # Printing.
-        if file_name is not None:
-            self.canvas.print_png(file_name)
-        
 
-        
-        #############################################################
-        
-    
+    def _line_is_visible(self):
+        return (self.line_x is not None and
+                self.data.minimum <= self.line_x <= self.data.maximum)
+
+
+    def _draw_vertical_line(self):
+        self.vertical_line = self.ax.axvline(
+            self.line_x,
+            ymin = 0,
+            ymax = 1,
+            color = self.line_color,
+            linewidth = 2,
+            alpha = self.conf['color_alpha'])
+
+
     def _set_line(self, line_dic):
         try:
             self.line_x = line_dic['number']
@@ -412,22 +941,115 @@ class Bars:
             raise TypeError(text.strip())
 
 
-    def _manage_title(self):
+    def _manage_layout(self, layout_template):
+        """
+        The layout of the components which don't depend on "numbers"
+        is either solved or read from a template. Solved layouts are
+        stored in the layout cache when it is enabled.
+        """
+        if layout_template is not None:
+            self._apply_layout_template(layout_template)
+        elif layout_cache.enabled:
+            key = self._get_layout_key()
+            layout_template = layout_cache.lookup(key)
+            if layout_template is not None:
+                self._apply_layout_template(layout_template)
+            else:
+                self._solve_layout()
+                layout_cache.store(key, self.get_layout_template())
+        else:
+            self._solve_layout()
+
+
+    def _solve_layout(self):
+        
+        if self.title is not None:
+            self._make_room_for_title()
+
+        # Left label constraint solving.
+        self._make_room_for_left_labels()
+
+        if self.ylabel is not None:
+            self._make_room_for_ylabel()
+
+        if self.legend is not None:
+            self._make_room_for_legend()
+
+        self._layout_template = {'x0' : self._x0,
+                                 'y0' : self._y0,
+                                 'width' : self._width,
+                                 'height' : self._height,
+                                 'legend_width' : self._legend_width}
+
+
+    def _apply_layout_template(self, layout_template):
+        
+        validate_layout_template(layout_template)
+        
+        self._x0 = layout_template['x0']
+        self._y0 = layout_template['y0']
+        self._width = layout_template['width']
+        self._height = layout_template['height']
+        self._set_position()
+        
+        self._left_label_data = self._get_left_label_data()
+        
+        if self.legend is not None:
+            self._legend_width = layout_template['legend_width']
+            self._place_legend()
+        
+        self._layout_template = dict(layout_template)
+
+
+    def get_layout_template(self):
+        """
+        The layout solved for the title, the left labels, the ylabel
+        and the legend. It can be passed to the constructor of a new
+        chart having the same configuration, titles, left labels and
+        legend (SEE catbars.layouts). The right labels and the
+        xlabel, which depend on "numbers", are always solved.
+        """
+        return dict(self._layout_template)
+
+
+    def _get_layout_key(self):
+        """
+        A hash of the inputs of _solve_layout().
+        """
+        left_labels = None
+        if self.data.left_labels is not None:
+            left_labels = [str(label) for label in self.data.left_labels]
+        elif self._overview is not False:
+            left_labels = self.data.anchors
+        legend = None
+        if self.legend is not None:
+            legend = (self.legend_title,
+                      [t.get_text() for t in self.legend.get_texts()])
+        inputs = (sorted(self.conf.items()),
+                  self.title,
+                  self.ylabel,
+                  left_labels,
+                  legend)
+        return hashlib.sha1(repr(inputs).encode()).hexdigest()
+
+
+    @timed('title')
+    def _draw_title(self):
         
         pad_in_points = self.fig_coord_to_points(self.fig,
                                                  self.conf['title_pad'],
                                                  axis = 'y')
-        title_label = self.ax.set_title(
+        self.ax.set_title(
             self.title,
             pad = pad_in_points,
             fontsize = self.conf['title_font_size'],
             fontweight = 'bold')
+
+
+    @timed('title')
+    def _make_room_for_title(self):
         
-        self.canvas.draw()
-        
-        h = title_label.get_window_extent(
-            renderer = self.canvas.get_renderer()
-            ).height
+        _, h = self._get_text_size(self.ax.title)
         
         h_in_fig_coord = self.disp_to_fig_coord(self.fig,
                                                 h,
@@ -439,6 +1061,7 @@ class Bars:
         self._set_position()
     
     
+    @timed('left_labels')
     def _make_room_for_left_labels(self):
         
         """
@@ -448,53 +1071,57 @@ class Bars:
         """
         
         
-        left_label_data = [] # To align left and right labels.
         min_x = None
-        self.canvas.draw()
         for left_label in self.ax.get_yticklabels():
-            x, y = left_label.get_position()
-            va = left_label.get_va()
-            bbox = left_label.get_window_extent(
-                    renderer = self.canvas.get_renderer()
-                 )
+            x0 = self._get_text_x0(left_label)
             
             inv = self.fig.transFigure.inverted()
-            lab_x, _ = inv.transform((bbox.x0, bbox.y0))
+            lab_x, _ = inv.transform((x0, 0))
             
             if min_x is None or lab_x < min_x:
                 min_x = lab_x # In pixels.
-            left_label_data.append((y, va))
         
         delta_x0 = abs(self._x0 - min_x)
         self._x0 = self._x0 + delta_x0
         self._width = self._width - delta_x0
         self._set_position()
         
-        self._left_label_data = left_label_data
+        self._left_label_data = self._get_left_label_data()
+
+
+    def _get_left_label_data(self):
+        """
+        To align left and right labels.
+        """
+        left_label_data = []
+        for left_label in self.ax.get_yticklabels():
+            x, y = left_label.get_position()
+            va = left_label.get_va()
+            left_label_data.append((y, va))
+        return left_label_data
     
     
     
-    def _manage_ylabel(self):
+    @timed('ylabel')
+    def _draw_ylabel(self):
         
-        """
-        """
         pad = self.fig_coord_to_points(self.fig,
                                        self._x_coeff * self.conf['pad'])
-        y_label = self.ax.set_ylabel(
+        self.ax.set_ylabel(
             self.ylabel,
             labelpad = pad,
             fontweight = 'bold',
             fontsize = self.conf['axis_title_font_size'])
+
+
+    @timed('ylabel')
+    def _make_room_for_ylabel(self):
         
-        self.canvas.draw()
-        
-        bbox = y_label.get_window_extent(
-                    renderer = self.canvas.get_renderer()
-                 )
+        width, _ = self._get_text_size(self.ax.yaxis.label)
         
 
         w_in_fig_coord = self.disp_to_fig_coord(self.fig,
-                                                bbox.width)
+                                                width)
         
         delta_x0 = (w_in_fig_coord +
                     self._x_coeff * self.conf['pad'])
@@ -505,7 +1132,9 @@ class Bars:
     
         
 
+    @timed('legend')
     def _draw_legend(self):
+        import matplotlib.patches as mpatches
                 
         artists = []
         labels = []
@@ -538,44 +1167,55 @@ class Bars:
         lgd.get_title().set_fontweight('bold')
         lgd.get_title().set_multialignment('center')
 
+        self.legend = lgd
         
-        self.canvas.draw()
+    
+
+    @timed('legend')
+    def _make_room_for_legend(self):
         
         # Constraint solving.
-        lgd_width = (lgd.get_window_extent(
-                          renderer = self.canvas.get_renderer()
-                          ).width)
+        if text_extent_cache.enabled:
+            lgd_width, _ = text_extent_cache.get(
+                legend_key(self.legend, self.fig.dpi),
+                partial(self._get_size, self.legend))
+        else:
+            lgd_width, _ = self._get_size(self.legend)
         
         lgd_width_in_fig_coord = self.disp_to_fig_coord(self.fig,
                                                         lgd_width)
-        self.legend = lgd
         self._legend_width = lgd_width_in_fig_coord
         
-        logging.info('legend width in pixels {}\n'.format(lgd_width))
+        logger.info('legend width in pixels %s\n', lgd_width)
         
-    
+        self._place_legend()
+        self._width = (self._width -
+                       self._legend_width -
+                       self._x_coeff *self.conf['pad'])
+        self._set_position()
 
-    def _make_room_for_legend(self):
+
+    def _place_legend(self):
         self.legend.set_bbox_to_anchor((1 -
                                         self._legend_width -
                                         self._x_coeff * self.conf['margin'],
                                         0.5))
-        self._width = (self._width -
-                       self._legend_width -
-                       self._x_coeff *self.conf['pad'])
-        self._set_position()
     
     
         
+    @timed('right_labels')
     def _draw_right_labels(self):
         
         """
         Right labels.
+        All the labels are created before being measured in a
+        batch by _make_room_for_right_labels(): the figure is
+        not drawn here.
         """
         right_label_texts = []
-        for i, bar in enumerate(self.bars):
+        # Bar widths are read from the model, not from the artists.
+        for i, w in enumerate(self.data.numbers.tolist()):
             y, va = self._left_label_data[i]
-            w = bar.get_width()
             t = None
             if self.data.right_labels is not None:
                 a_right_label = self.data.right_labels[i]
@@ -583,19 +1223,23 @@ class Bars:
                 t = self.ax.text(w, y,
                                  text,
                                  verticalalignment = va,
+                                 fontsize = self.conf['data_font_size'],
                                  fontweight = 'normal',
                                  zorder = 10)
                 right_label_texts.append(t)
-                self.canvas.draw()
         self._right_label_texts = right_label_texts
         
                                 
     
+    @timed('right_label_layout')
     def _make_room_for_right_labels(self):
         
         """
         Constraint solving in figure coordinates.
-        A bisection technique is used.
+        The right edge of the right labels is a maximum of linear
+        functions of the axes width: the largest feasible width is
+        solved directly. A bisection technique is used as a fallback
+        when some bar coefficients are not finite.
         """
         def _objective_function(coeff_array,
                                 label_array,
@@ -603,90 +1247,109 @@ class Bars:
             #
             return max(x, max(coeff_array * x + label_array))
 
-        bar_coeff = []
-        text_widths = []
-        for i, bar in enumerate(self.bars):
-            bar_coeff.append(self._get_bar_coeff(bar))
-            t = self._right_label_texts[i]
-            text_widths.append(self._get_text_width(t))
-        
-        coeff_array = np.array(bar_coeff)
-        label_array = np.array(text_widths)
+        coeff_array = self._get_bar_coeffs()
+        label_array = np.array([self._get_text_width(t)
+                                for t in self._right_label_texts])
         
         f = partial(_objective_function,
                     coeff_array,
-                    text_widths)
+                    label_array)
         
         min_w = self.conf['min_ax_width']
-        max_it = self.conf['right_label_max_it']
-        tolerance = self.conf['right_label_solver_tolerance']
         
         # Two special cases.
         if f(self._width) == self._width:        
             pass
         # To check whether a solution exists.
         elif f(min_w) < self._width:
-            w_b = self._width
-            w_a = min_w
-            i = 0
-            # To prevent from infinite loops.
-            while abs(w_b - w_a) > tolerance and i < max_it:
-                new_w = w_a + (w_b - w_a) / 2
-                if f(new_w) < self._width:
-                    w_a = new_w
-                else:
-                    w_b = new_w
-                logging.info('w_a {}\nw_b {}\n'.format(w_a, w_b))
-                i += 1
-            self._width = w_a
+            if np.all(np.isfinite(coeff_array)):
+                self._width = self._solve_right_label_width(coeff_array,
+                                                            label_array)
+            else:
+                self._width = self._bisect_right_label_width(f)
         else:
             self._width = min_w
 
         self._set_position()
 
+
+    def _solve_right_label_width(self,
+                                 coeff_array,
+                                 label_array):
+        """
+        Closed-form solution of
+        max(x, max(coeff_array * x + label_array)) <= self._width.
+        Each bar growing with the axes width gives an upper bound.
+        The other bars are already known to fit (f(min_w) < width).
+        """
+        growing = coeff_array > 0
+        w = self._width
+        if np.any(growing):
+            bounds = ((self._width - label_array[growing]) /
+                      coeff_array[growing])
+            w = min(w, float(bounds.min()))
+        return max(w, self.conf['min_ax_width'])
+
+
+    def _bisect_right_label_width(self, f):
+        """
+        Bisection on [min_ax_width, width]. f(min_ax_width) has to be
+        lower than the current width.
+        """
+        max_it = self.conf['right_label_max_it']
+        tolerance = self.conf['right_label_solver_tolerance']
+        w_b = self._width
+        w_a = self.conf['min_ax_width']
+        i = 0
+        # To prevent from infinite loops.
+        while abs(w_b - w_a) > tolerance and i < max_it:
+            new_w = w_a + (w_b - w_a) / 2
+            if f(new_w) < self._width:
+                w_a = new_w
+            else:
+                w_b = new_w
+            logger.info('w_a %s\nw_b %s\n', w_a, w_b)
+            i += 1
+
         if i == max_it:
-            logging.warning("""
-right_label_max_it {} has been hit.
-""".format(max_it))
+            logger.warning('right_label_max_it %s has been hit.', max_it)
+        return w_a
     
     
-    def _get_bar_coeff(self, bar):
+    def _get_bar_coeffs(self):
         """
-        bar_width_in_ax_coord can't be greater than 0.95 if
+        Bar widths in axes coordinates, computed with one batched
+        transform. bar_width_in_ax_coord can't be greater than 0.95 if
         xmargin = 0.05.
         """
-        data_x_one = bar.get_bbox().x1 # Assuming that x0 = 0.
-        disp_x_one, _ = self.ax.transData.transform((data_x_one, 0))
+        data_x_one = np.asarray(self.data.numbers,
+                                dtype = float) # Assuming that x0 = 0.
+        data_points = np.column_stack([data_x_one,
+                                       np.zeros_like(data_x_one)])
+        disp_points = self.ax.transData.transform(data_points)
         inv = self.ax.transAxes.inverted()
-        bar_width_in_ax_coord, _ = inv.transform((disp_x_one, _))
-        return bar_width_in_ax_coord
+        return inv.transform(disp_points)[:, 0]
 
 
     def _get_text_width(self, t):
         
-        t_width = t.get_window_extent(
-            renderer = self.canvas.get_renderer()
-            ).width # In pixels.
+        t_width, _ = self._get_text_size(t) # In pixels.
         
         return self.disp_to_fig_coord(self.fig, t_width)
     
     
             
+    @timed('x_ticklabels')
     def _clean_x_ticklabels(self):
         """
         To discard overlaps.
         """
-        
-        self.canvas.draw()
-            
         labels = self.get_visible_ticklabels(
                         self.ax,
                         self.ax.xaxis.get_ticklabels(which = 'both')
                         )
         
-        label_bboxes = [lab.get_window_extent(
-                             renderer = self.canvas.get_renderer()
-                             ) 
+        label_bboxes = [self._get_window_extent(lab)
                         for lab in labels]
         
         
@@ -707,6 +1370,7 @@ right_label_max_it {} has been hit.
     
 
     
+    @timed('xlabel')
     def _manage_xlabel(self,
                        min_tick_y):
         """
@@ -722,12 +1386,9 @@ right_label_max_it {} has been hit.
             fontweight = 'bold',
             fontsize = self.conf['axis_title_font_size'])
         
-        self.canvas.draw()
-        bbox = x_label.get_window_extent(
-                    renderer = self.canvas.get_renderer()
-                 )
+        _, height = self._get_text_size(x_label)
         h = self.disp_to_fig_coord(self.fig,
-                                   bbox.height,
+                                   height,
                                    axis = 'y')
         
         delta_y0 = abs(self._y0 - min_tick_y) + h + self.conf['pad']
@@ -735,20 +1396,67 @@ right_label_max_it {} has been hit.
         self._y0 = self._y0 + delta_y0
         self._height = self._height - delta_y0
         self._set_position()
-        
-        self.canvas.draw()
 
     
+    def _get_window_extent(self, artist):
+        """
+        Bounding box of an artist in display coordinates.
+        Extents are read from the renderer text metrics: the
+        figure is not drawn. Tick labels are updated by Matplotlib
+        when they are requested.
+        """
+        if self._instrumented:
+            self.counts['text_measurements'] += 1
+        return artist.get_window_extent(
+            renderer = self.canvas.get_renderer())
+
+
+    def _get_size(self, artist):
+        bbox = self._get_window_extent(artist)
+        return (bbox.width, bbox.height)
+
+
+    def _get_text_size(self, t):
+        """
+        Width and height of a Text instance in display coordinates.
+        They are read from the process-wide text extent cache when
+        it is enabled (SEE catbars.extents).
+        """
+        if not text_extent_cache.enabled:
+            # The key is not built.
+            return self._get_size(t)
+        return text_extent_cache.get(text_key(t, self.fig.dpi),
+                                     partial(self._get_size, t))
+
+
+    def _get_text_x0(self, t):
+        """
+        Left edge of a Text instance in display coordinates.
+        Horizontal texts can use the cached text width because
+        only their anchor depends on the layout.
+        """
+        if not text_extent_cache.enabled or t.get_rotation() != 0:
+            return self._get_window_extent(t).x0
+
+        width, _ = self._get_text_size(t)
+        x, _ = t.get_transform().transform(t.get_unitless_position())
+        offset = {'left' : 0,
+                  'center' : 0.5,
+                  'right' : 1}[t.get_horizontalalignment()]
+        return x - offset * width
+
+
     def _set_position(self):
         self.ax.set_position([self._x0,
                               self._y0,
                               self._width,
                               self._height])
-        positions = ['x0', 'y0', 'width', 'height']
-        text = 'Position of the Axes instance edges\n'
-        for pos in positions:
-            text = text + '{} {}\n'.format(pos, getattr(self, '_'+pos))
-        logging.info(text)
+        if logger.isEnabledFor(logging.INFO):
+            positions = ['x0', 'y0', 'width', 'height']
+            text = 'Position of the Axes instance edges\n'
+            for pos in positions:
+                text = text + '{} {}\n'.format(pos, getattr(self, '_'+pos))
+            logger.info(text)
                 
                 
         
@@ -837,16 +1545,275 @@ right_label_max_it {} has been hit.
 
 
     
-    def print_pdf(self, file_name):
+    @timed('update')
+    def update(self,
+               numbers,
+               right_labels = None,
+               colors = None):
+        """
+        In-place update for live charts.
+
+        The model is built again from the new "numbers" (and optionally
+        new "right_labels" and "colors") with the other constructor
+        arguments. The figure and the bar artists are reused. The title,
+        left label, ylabel and legend constraint solving is only run
+        again if the left labels or the legend entries have changed.
+        The figure is drawn once.
+
+        The number of displayed bars can't change. If "auto_scale" is
+        True and the x scale changes, the figure is built again.
+        """
+        kwargs = dict(self._model_kwargs)
+        # The new numbers are the whole dataset.
+        kwargs['summary'] = None
+        if right_labels is not None:
+            kwargs['right_labels'] = right_labels
+        if colors is not None:
+            kwargs['colors'] = colors
+        data = self._build_model(numbers, kwargs)
+        if data.length != self.data.length:
+            text = """
+The number of displayed bars can't change ({} instead of {}).
+A new Bars instance has to be built.
+""".format(data.length, self.data.length)
+            raise ValueError(text.strip())
         
-        from matplotlib.backends.backend_pdf import PdfPages
+        self._model_kwargs = kwargs
+        self._set_data(data)
+        self._notify('update')
+
+
+    def _set_data(self, data):
+        """
+        The figure is updated for a new model (SEE update()). It is
+        built again if the number of bars changes.
+        """
+        with _mpl_lock:
+            if self._pending_build is not None:
+                # The figure has not been built yet (lazy option).
+                self.data = data
+                return
+            
+            old_data = self.data
+            old_legend = self._get_legend_entries()
+            self.data = data
+            
+            if (self._overview is not False or
+                data.length != old_data.length or
+                self._get_xscale() != self.ax.get_xscale()):
+                #
+                self._rebuild_figure()
+                return
+            
+            self._update_artists(old_data)
+            
+            if (sorted(self._get_left_label_texts(old_data)) !=
+                sorted(self._get_left_label_texts(data)) or
+                self._get_legend_entries() != old_legend):
+                #
+                if self.legend is not None:
+                    self.legend.remove()
+                    self.legend = None
+                if (self.legend_visible is True and
+                    self.data.colors is not None):
+                    #
+                    self._draw_legend()
+                self._set_margins()
+                self._manage_layout(None)
+            else:
+                self._apply_layout_template(self._layout_template)
+            
+            # Tick labels hidden by _clean_x_ticklabels().
+            for tick in [*self.ax.xaxis.majorTicks,
+                         *self.ax.xaxis.minorTicks]:
+                tick.label1.set_visible(True)
+            
+            self._solve_data_layout()
+            
+            self._draw_canvas()
+
+
+    def _update_artists(self, old_data):
+        """
+        Bars, tick labels, the vertical line and right labels are
+        modified in place.
+        """
+        from matplotlib.collections import PolyCollection
+
+        if (self._get_left_label_texts(old_data) !=
+            self._get_left_label_texts(self.data)):
+            #
+            self.ax.yaxis.set_ticklabels(
+                self._get_left_label_texts(self.data))
+        
+        colors = self.data.actual_colors
+        if colors is None:
+            colors = [self.data.default_color] * self.data.length
+        if isinstance(self.bars, PolyCollection):
+            self.bars.set_verts(self._get_bar_vertices(self.data.numbers),
+                                closed = True)
+            self.bars.set_facecolor(colors)
+        else:
+            for bar, number, color in zip(self.bars,
+                                          self.data.numbers,
+                                          colors):
+                bar.set_width(number)
+                bar.set_facecolor(color)
+        
+        if self._virtual_bars is not None:
+            self._virtual_bars[0].set_width(self.data.minimum)
+            self._virtual_bars[1].set_width(self.data.maximum)
+        
+        if self._line_is_visible() and self.vertical_line is None:
+            self._draw_vertical_line()
+        elif not self._line_is_visible() and self.vertical_line is not None:
+            self.vertical_line.remove()
+            self.vertical_line = None
+        
+        # x bounds.
+        self.ax.relim()
+        if isinstance(self.bars, PolyCollection):
+            # relim() ignores collections.
+            self.ax.update_datalim(self.bars.get_datalim(self.ax.transData))
+        self.ax.autoscale_view()
+        
+        # Right labels.
+        if self.data.right_labels is None:
+            for t in self._right_label_texts or []:
+                t.remove()
+            self._right_label_texts = None
+        elif self._right_label_texts is None:
+            self._draw_right_labels()
+        else:
+            for i, w in enumerate(self.data.numbers.tolist()):
+                t = self._right_label_texts[i]
+                t.set_x(w)
+                t.set_text(' {}'.format(self.data.right_labels[i]))
 
-        pp = PdfPages(file_name)
-        pp.savefig(figure = self.fig)
-        pp.close()
+
+    def _get_xscale(self):
+        if (self._auto_scale is True and
+            (self.data.spread > 1 or self.data.maximum > 1e6)):
+            #
+            return 'log'
+        return 'linear'
+
+
+    def _rebuild_figure(self):
+        """
+        The Matplotlib objects are discarded and built again from
+        the current model.
+        """
+        self.vertical_line = None
+        self.legend = None
+        self._legend_width = 0
+        self._virtual_bars = None
+        self._right_label_texts = None
+        self._encoded_outputs.clear()
+        self._canvas_is_current = False
+        self._pending_build = (self._auto_scale, None)
+        self._ensure_figure()
+
+
+    def _get_left_label_texts(self, data):
+        if data.left_labels is None:
+            return [''] * data.length
+        return [str(label) for label in data.left_labels]
+
+
+    def _get_legend_entries(self):
+        if self.legend_visible is not True or self.data.colors is None:
+            return None
+        return (list(self.data.legend_labels),
+                list(self.data.legend_colors),
+                self.vertical_line is not None)
+
+
+    def print_pdf(self, file_name):
+        self._write(self.to_bytes('pdf'), file_name)
 
     def print_png(self, file_name):
-        self.canvas.print_png(file_name)
+        self._write(self.to_bytes('png'), file_name)
+
+
+    def to_bytes(self,
+                 format = 'png',
+                 **kwargs):
+        """
+        The chart encoded in "png" or "pdf" format. kwargs are passed
+        to the Matplotlib print method.
+        Encoded outputs are cached per format and options: the same
+        bytes object is returned until the figure is modified or
+        drawn again.
+        """
+        if format not in ['png', 'pdf']:
+            raise ValueError('"format" has to be either "png" or "pdf".')
+        key = (format, repr(sorted(kwargs.items())))
+        with _mpl_lock:
+            fig = self.fig
+            if fig.stale:
+                self._encoded_outputs.clear()
+                self._canvas_is_current = False
+            if key not in self._encoded_outputs:
+                buf = BytesIO() # In-memory bytes buffer.
+                self._encoding = True
+                try:
+                    self._encode(format, buf, **kwargs)
+                finally:
+                    self._encoding = False
+                # The pdf backend changes the dpi temporarily.
+                fig.stale = False
+                self._encoded_outputs[key] = buf.getvalue()
+                self._notify('encode')
+            return self._encoded_outputs[key]
+
+
+    @timed('encode')
+    def _encode(self, format, buf, **kwargs):
+        if (format == 'png' and
+            self._canvas_is_current and
+            set(kwargs) <= {'metadata', 'pil_kwargs'}):
+            # The figure has just been drawn (by the constructor or
+            # update()): the Agg buffer is saved as FigureCanvasAgg
+            # does, without drawing it again.
+            import matplotlib.image
+
+            matplotlib.image.imsave(buf,
+                                    self.canvas.buffer_rgba(),
+                                    format = 'png',
+                                    origin = 'upper',
+                                    dpi = self.fig.dpi,
+                                    **kwargs)
+        elif format == 'png':
+            self.canvas.print_png(buf, **kwargs)
+        else:
+            from matplotlib.backends.backend_pdf import PdfPages
+
+            pp = PdfPages(buf)
+            pp.savefig(figure = self.fig, **kwargs)
+            pp.close()
+
+
+    def _write(self, b, file_name):
+        if isinstance(file_name, (str, os.PathLike)):
+            with open(file_name, 'wb') as f:
+                f.write(b)
+        else:
+            file_name.write(b)
+
+
+    def _on_draw(self, event):
+        """
+        Encoded outputs are discarded when the figure is drawn by
+        another method than to_bytes().
+        """
+        if self._instrumented:
+            self.counts['draws'] += 1
+        if not self._encoding:
+            self._encoded_outputs.clear()
+        if event.renderer is getattr(self._canvas, 'renderer', None):
+            # Agg drawing (not pdf).
+            self._canvas_is_current = True
 
 
     def _repr_png_(self):
@@ -854,9 +1821,57 @@ right_label_max_it {} has been hit.
         For notebook integration.
         """
         w, h = self.fig.get_size_inches()
-        buf  = BytesIO() # In-memory bytes buffer.
-        self.canvas.print_png(buf)
-        return (buf.getvalue(),
+        return (self.to_bytes('png'),
                 {'width' : str(w * self.fig.dpi),
                  'height': str(h * self.fig.dpi)})
 
+
+
+def warmup(conf = None, formats = ('png',)):
+    """
+    Loads what the first chart of a process would load: the
+    Matplotlib modules, the font cache, the fonts at the sizes and
+    weights of the configuration, their glyphs, the mathtext parser
+    (scientific notation and logarithmic tick labels) and the Agg
+    renderer. The first chart is then as fast as the next ones.
+
+    It can be called before fork() (for instance in a pre-forking
+    server): the child processes inherit the warm state. The warm-up
+    charts are reported to the registered hooks (SEE
+    catbars.instrumentation).
+
+    Parameters
+    -----------
+    conf : dict, optional
+        Configuration parameters as passed to the Bars constructor
+        (SEE Bars.conf).
+
+    formats : iterable of str, optional
+        The encodings to warm up: 'png' (default value) and 'pdf'.
+    """
+    conf = dict() if conf is None else dict(conf)
+    # Every printable ASCII character. A pair of "$" would be parsed
+    # as mathtext.
+    labels = [string.ascii_uppercase,
+              string.ascii_lowercase,
+              string.digits,
+              string.punctuation.replace('$', '')]
+    # Scientific notation on a linear scale, powers of 10 on a
+    # logarithmic scale.
+    numbers = [3e7, 2e6, 4e4, 500]
+    for auto_scale in [False, True]:
+        bars = Bars(numbers,
+                    left_labels = labels,
+                    right_labels = labels[::-1],
+                    colors = labels,
+                    line_dic = {'number' : 1e6,
+                                'label' : labels[0],
+                                'color' : 'black'},
+                    auto_scale = auto_scale,
+                    title = labels[0],
+                    xlabel = labels[1],
+                    ylabel = labels[2],
+                    legend_title = labels[3],
+                    **conf)
+        for format in formats:
+            bars.to_bytes(format)
@@ -0,0 +1,247 @@
+"""
+Batch rendering.
+
+The construction of a Bars instance is CPU-bound and figure work is
+serialized within a process (Matplotlib is not thread-safe).
+render_many() renders charts in a pool of worker processes:
+
+    import catbars
+
+    specs = [{'numbers' : [4, 1, 3], 'title' : 'A'},
+             {'numbers' : [2, 8, 5], 'title' : 'B'}]
+    for result in catbars.render_many(specs, workers = 4):
+        if result.error is None:
+            png = result.output
+
+"""
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from concurrent.futures.process import BrokenProcessPool
+from collections import namedtuple
+import itertools
+import os
+import traceback
+
+from .bars import Bars
+
+
+FORMATS = ['png', 'pdf']
+
+
+RenderResult = namedtuple('RenderResult', ['index', 'output', 'error'])
+RenderResult.__doc__ = """
+"index" is the zero-based position of the spec in the input.
+"output" is either the encoded chart (bytes) or the path it has been
+written to. It is None if the chart couldn't be rendered: "error" then
+contains the formatted traceback.
+"""
+
+
+CRASH_MESSAGE = """
+The worker process rendering this chart has died (for instance, it
+has been killed or has crashed).
+""".lstrip()
+
+
+def _print(bars, format, file_name):
+    if format == 'png':
+        bars.print_png(file_name)
+    else:
+        bars.print_pdf(file_name)
+
+
+def _render(index, spec, format, path):
+    """
+    Rendering of one chart. Exceptions are caught to isolate failures.
+    """
+    try:
+        bars = Bars(**spec)
+        if path is None:
+            output = bars.to_bytes(format)
+        else:
+            _print(bars, format, path)
+            output = path
+        return RenderResult(index, output, None)
+    except Exception:
+        return RenderResult(index, None, traceback.format_exc())
+
+
+def render_many(specs,
+                format = 'png',
+                workers = None,
+                paths = None,
+                ordered = True):
+    """
+    Generator rendering many charts in a pool of worker processes.
+
+    Parameters
+    -----------
+    specs : iterable of dict
+        Each dict contains the keyword arguments of a Bars constructor
+        call (including "numbers").
+
+    format : str, optional
+        'png' (default value) or 'pdf'.
+
+    workers : int, optional
+        The number of worker processes. The default value is the number
+        of CPUs. With 1 worker, charts are rendered in the calling
+        process.
+
+    paths : iterable, optional
+        Paths (or file-like objects) to write the charts to, in the
+        order of "specs". By default, the encoded charts are returned.
+        With several workers, charts are encoded in the workers and
+        written to file-like objects by the calling process.
+
+    ordered : bool, optional
+        If True (default value), results are yielded in input order.
+        Otherwise, they are yielded as soon as they are rendered.
+
+    Yields
+    -------
+    catbars.batch.RenderResult
+        A failing chart yields a result with an "error" and doesn't
+        interrupt the batch, even if it kills its worker process.
+    """
+    if format not in FORMATS:
+        raise ValueError('"format" has to be either "png" or "pdf".')
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if paths is None:
+        paths = itertools.repeat(None)
+
+    tasks = ((i, spec, format, path) for i, (spec, path)
+             in enumerate(zip(specs, paths)))
+
+    if workers <= 1:
+        for task in tasks:
+            yield _render(*task)
+        return
+
+    yield from _stream(workers,
+                       tasks,
+                       ordered,
+                       max_pending = 4 * workers)
+
+
+def _is_path(path):
+    return isinstance(path, (str, os.PathLike))
+
+
+def _submit(executor, task):
+    """
+    File-like objects can't be shared with a worker process: the
+    worker returns the encoded chart instead (SEE _write_output()).
+    """
+    index, spec, format, path = task
+    if path is not None and not _is_path(path):
+        path = None
+    return executor.submit(_render, index, spec, format, path)
+
+
+def _write_output(task, result):
+    path = task[3]
+    if path is None or _is_path(path) or result.error is not None:
+        return result
+    try:
+        path.write(result.output)
+    except Exception:
+        return RenderResult(result.index, None, traceback.format_exc())
+    return result._replace(output = path)
+
+
+def _get_result(task, future):
+    try:
+        result = future.result()
+    except Exception:
+        # For instance, a spec which can't be pickled.
+        result = RenderResult(task[0], None, traceback.format_exc())
+    return _write_output(task, result)
+
+
+def _is_broken(future):
+    return isinstance(future.exception(), BrokenProcessPool)
+
+
+def _stream(workers,
+            tasks,
+            ordered,
+            max_pending):
+    """
+    At most "max_pending" charts are submitted or buffered at a time
+    so that memory doesn't depend on the number of specs.
+
+    When a worker dies, the pool is broken and every pending chart
+    fails: these charts are rendered again (SEE _isolate()) and the
+    pool is replaced.
+    """
+    pending = dict() # Futures to tasks.
+    buffer = dict() # Indices to results (ordered mode).
+    next_index = 0
+    exhausted = False
+    executor = ProcessPoolExecutor(max_workers = workers)
+    try:
+        while True:
+            while (not exhausted and
+                   len(pending) + len(buffer) < max_pending):
+                try:
+                    task = next(tasks)
+                except StopIteration:
+                    exhausted = True
+                    break
+                pending[_submit(executor, task)] = task
+
+            if not pending:
+                break
+
+            done, _ = wait(pending, return_when = FIRST_COMPLETED)
+            if any(_is_broken(future) for future in done):
+                # The other pending futures are failing as well.
+                done, _ = wait(pending)
+            results = []
+            crashed = []
+            for future in done:
+                task = pending.pop(future)
+                if _is_broken(future):
+                    crashed.append(task)
+                else:
+                    results.append(_get_result(task, future))
+            if crashed:
+                executor.shutdown()
+                results.extend(_isolate(crashed))
+                executor = ProcessPoolExecutor(max_workers = workers)
+
+            for result in results:
+                if ordered:
+                    buffer[result.index] = result
+                else:
+                    yield result
+
+            while next_index in buffer:
+                yield buffer.pop(next_index)
+                next_index += 1
+    finally:
+        executor.shutdown()
+
+
+def _isolate(tasks):
+    """
+    Charts pending when a worker died are rendered again one at a time
+    in a single worker process: only the chart killing its worker
+    yields an error.
+    """
+    results = []
+    executor = ProcessPoolExecutor(max_workers = 1)
+    try:
+        for task in tasks:
+            future = _submit(executor, task)
+            wait([future])
+            if _is_broken(future):
+                results.append(RenderResult(task[0], None, CRASH_MESSAGE))
+                executor.shutdown()
+                executor = ProcessPoolExecutor(max_workers = 1)
+            else:
+                results.append(_get_result(task, future))
+    finally:
+        executor.shutdown()
+    return results
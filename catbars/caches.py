@@ -0,0 +1,117 @@
+"""
+Process-wide caches.
+
+LRUCache is the thread-safe, size-bounded cache shared by the text
+extent cache (SEE catbars.extents) and the layout cache (SEE
+catbars.layouts). A cache is disabled until it is given a size.
+"""
+from collections import OrderedDict
+import threading
+
+
+class LRUCache:
+    """
+    A thread-safe, size-bounded LRU cache. The least recently used
+    items are discarded first.
+
+    Parameters
+    -----------
+    maxsize : int, optional
+        The maximum number of items kept in memory. The cache is
+        disabled if maxsize is 0 (default value).
+
+    Attributes
+    -----------
+    hits : int
+    misses : int
+    """
+
+    def __init__(self, maxsize = 0):
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+
+
+    def _reset_lock(self):
+        """
+        Called in a forked child (the lock may have been held by
+        another thread of the parent).
+        """
+        self._lock = threading.Lock()
+
+
+    @property
+    def enabled(self):
+        return self.maxsize > 0
+
+
+    def resize(self, maxsize):
+        """
+        A size of 0 disables the cache.
+        """
+        with self._lock:
+            self.maxsize = maxsize
+            while len(self._items) > self.maxsize:
+                self._items.popitem(last = False)
+
+
+    def clear(self):
+        """
+        Items and counters are discarded.
+        """
+        with self._lock:
+            self._items.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+    def get(self, key, compute):
+        """
+        compute() is called without arguments when the key is missing.
+        Its result is stored and returned.
+        """
+        if not self.enabled:
+            return compute()
+
+        value = self.lookup(key)
+        if value is None:
+            value = compute()
+            self.store(key, value)
+        return value
+
+
+    def lookup(self, key):
+        """
+        None is returned (and a miss is counted) if the key is missing.
+        """
+        with self._lock:
+            if key in self._items:
+                self._items.move_to_end(key)
+                self.hits += 1
+                return self._items[key]
+            self.misses += 1
+            return None
+
+
+    def store(self, key, value):
+        if not self.enabled:
+            return
+        with self._lock:
+            self._items[key] = value
+            self._items.move_to_end(key)
+            while len(self._items) > self.maxsize:
+                self._items.popitem(last = False)
+
+
+    def stats(self):
+        with self._lock:
+            return {'hits' : self.hits,
+                    'misses' : self.misses,
+                    'size' : len(self._items),
+                    'maxsize' : self.maxsize}
+
+
+    def __len__(self):
+        return len(self._items)
@@ -0,0 +1,185 @@
+"""
+Columnar inputs.
+
+Bars.from_frame() reads the features of a chart from the columns of
+a table: a pandas DataFrame, a dict of arrays or a structured array
+(any object supporting the buffer protocol with named fields).
+Columns are read as arrays without copying. Categorical columns are
+read as integer codes into a table of categories: the values are
+only looked up for the rows which are displayed.
+
+    from catbars import Bars
+
+    Bars.from_frame(df,
+                    numbers = 'cap',
+                    right_labels = 'name',
+                    colors = 'sector',
+                    sort = True,
+                    slice = (1, 30))
+
+When pandas is installed, the same chart is built by (SEE
+catbars.accessors):
+
+    df.catbars.barh(numbers = 'cap', ...)
+
+Arrays saved with NumPy can be memory-mapped: the model reads them
+chunk by chunk and only copies the displayed rows.
+
+    columns = load_npz('day.npz') # Or np.load('x.npy', mmap_mode = 'r').
+    columns['sector'] = CodedColumn(columns['sector_codes'],
+                                    ['Energy', 'Finance', 'Health'])
+    Bars.from_frame(columns, numbers = 'cap', colors = 'sector')
+
+"""
+import zipfile
+
+import numpy as np
+
+from .models import CHUNK_SIZE
+
+
+class CodedColumn:
+    """
+    A feature stored as integer codes into a table of values, like
+    pandas.Categorical. Iterating over it yields the values.
+
+    Parameters
+    -----------
+    codes : array_like of int
+        A negative code stands for a missing value (NaN).
+
+    categories : iterable
+        The table of values.
+    """
+
+    def __init__(self, codes, categories):
+        self.codes = np.asarray(codes)
+        self.categories = list(categories)
+        # The code -1 indexes NaN.
+        self._values = self.categories + [np.nan]
+
+
+    def __len__(self):
+        return len(self.codes)
+
+
+    def __iter__(self):
+        values = self._values
+        for i in range(0, len(self.codes), CHUNK_SIZE):
+            yield from (values[code] for code
+                        in self.codes[i:i + CHUNK_SIZE].tolist())
+
+
+    def __getitem__(self, i):
+        return self._values[self.codes[i]]
+
+
+    def take(self, indices):
+        """
+        The values at the given positions, as a list.
+        """
+        values = self._values
+        return [values[code] for code in self.codes.take(indices).tolist()]
+
+
+
+def get_column(data, name):
+    """
+    The column "name" of a DataFrame, a mapping or a structured array
+    (SEE read_column()).
+    """
+    if not hasattr(data, 'keys'):
+        # Buffer protocol: fields are views of the buffer.
+        data = np.asarray(data)
+        if data.dtype.names is None:
+            text = """
+"data" has to be a DataFrame, a mapping of columns or an array
+with named fields.
+"""
+            raise TypeError(text.strip())
+    try:
+        column = data[name]
+    except (KeyError, ValueError):
+        raise KeyError('There is no column "{}".'.format(name))
+    return read_column(column)
+
+
+def has_column(data, name):
+    if not isinstance(name, str):
+        return False
+    if hasattr(data, 'keys'):
+        return name in data.keys()
+    names = np.asarray(data).dtype.names
+    return names is not None and name in names
+
+
+def read_column(column):
+    """
+    pandas categorical columns are turned into CodedColumn instances.
+    Other pandas columns are kept as they are. Other columns are
+    converted to arrays (without copying if they support the buffer
+    protocol).
+    """
+    if hasattr(column, 'cat'):
+        return CodedColumn(column.cat.codes.to_numpy(),
+                           column.cat.categories)
+    if hasattr(column, 'iloc') or isinstance(column, CodedColumn):
+        return column
+    return np.asarray(column)
+
+
+
+def load_npz(file_name, allow_pickle = False):
+    """
+    The arrays of a .npz file, as a dict. The arrays of an
+    uncompressed archive (numpy.savez()) are memory-mapped. The
+    arrays of a compressed archive (numpy.savez_compressed()) and
+    object arrays (SEE numpy.load() for "allow_pickle") are loaded
+    into memory.
+    """
+    columns = dict()
+    with zipfile.ZipFile(file_name) as archive:
+        for info in archive.infolist():
+            name = info.filename
+            if name.endswith('.npy'):
+                name = name[:-len('.npy')]
+            array = None
+            if info.compress_type == zipfile.ZIP_STORED:
+                array = _map_member(file_name, info)
+            if array is None:
+                with archive.open(info) as f:
+                    array = np.lib.format.read_array(
+                        f,
+                        allow_pickle = allow_pickle)
+            columns[name] = array
+    return columns
+
+
+def _map_member(file_name, info):
+    """
+    Memory-mapping of a .npy file stored in a zip archive (None if
+    it contains Python objects).
+    """
+    with open(file_name, 'rb') as f:
+        # Local file header: 30 bytes, the file name and an extra field.
+        f.seek(info.header_offset)
+        header = f.read(30)
+        name_length = int.from_bytes(header[26:28], 'little')
+        extra_length = int.from_bytes(header[28:30], 'little')
+        f.seek(info.header_offset + 30 + name_length + extra_length)
+        version = np.lib.format.read_magic(f)
+        if version == (1, 0):
+            shape, fortran_order, dtype = (
+                np.lib.format.read_array_header_1_0(f))
+        else:
+            shape, fortran_order, dtype = (
+                np.lib.format.read_array_header_2_0(f))
+        offset = f.tell()
+    if dtype.hasobject:
+        return None
+    return np.memmap(file_name,
+                     dtype = dtype,
+                     mode = 'r',
+                     offset = offset,
+                     shape = shape,
+                     order = 'F' if fortran_order else 'C')
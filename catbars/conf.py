@@ -1,6 +1,6 @@
 
-from matplotlib import rcdefaults, rcParams
 import copy
+import warnings
 
 
 class Conf:
@@ -50,31 +50,47 @@ class Conf:
         
         'axis_title_font_size' : 10,
         
-        'data_font_size' : 8
+        'data_font_size' : 8,
+
+        # Charts with at least this number of bars draw them as a
+        # single collection (SEE Bars._draw_bar_collection()), which
+        # is faster and lighter for thousands of bars. "Bars.bars" is
+        # then a PolyCollection. None (default value): always patches.
+        'bar_collection_threshold' : None,
+
+        # Bars.timings and Bars.counts are recorded
+        # (SEE catbars.instrumentation).
+        'instrumented' : False
         }
         
     def run_conf(conf_dic):
         """
-        Settings that are not handled explicitly in bars.py are
-        delegated to Matplotlib.
+        Deprecated: Bars doesn't call this function. It sizes its
+        fonts explicitly and leaves rcParams untouched so that charts
+        can be built concurrently and the settings of the host
+        application are preserved.
+
+        Matplotlib defaults are restored and "data_font_size" is set
+        as the global default font size.
         """
-        # To override settings that are not related to Catbars.
-        rcdefaults() 
-        
-        if 'data_font_size' in conf_dic:
-            rcParams['font.size'] = conf_dic['data_font_size']
-        else:
-            rcParams['font.size'] = Conf.conf['data_font_size']
+        warnings.warn('Conf.run_conf() is deprecated: Bars leaves '
+                      'rcParams untouched.',
+                      DeprecationWarning,
+                      stacklevel = 2)
+        from matplotlib import rcdefaults, rcParams
+
+        rcdefaults()
+        rcParams['font.size'] = conf_dic.get('data_font_size',
+                                             Conf.conf['data_font_size'])
 
 
     def change_conf(conf_dic):
+        """
+        A new configuration dict. Conf.conf is not modified.
+        """
         new_conf = copy.deepcopy(Conf.conf)
         for k in conf_dic:
             if k in Conf.conf:
                 new_conf[k] = conf_dic[k]
 
-        Conf.run_conf(new_conf)
         return new_conf
-
-
-
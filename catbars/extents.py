@@ -0,0 +1,71 @@
+"""
+Process-wide cache of text extents.
+
+Measuring a text requires Matplotlib to lay it out with the
+renderer text metrics. Charts rendered in batches often share their
+tick labels, legend labels and titles: their extents can be reused
+from one Bars instance to another.
+
+The cache is disabled by default. It is enabled by giving it
+a size:
+
+    import catbars
+    catbars.text_extent_cache.resize(4096)
+
+"""
+import os
+
+from .caches import LRUCache
+
+
+class ExtentCache(LRUCache):
+    """
+    A size-bounded LRU cache mapping text keys (SEE text_key()) to
+    (width, height) extents in display coordinates (SEE
+    catbars.caches.LRUCache).
+
+    Parameters
+    -----------
+    maxsize : int, optional
+        The maximum number of extents kept in memory. The cache is
+        disabled if maxsize is 0 (default value).
+    """
+
+    def get(self, key, measure):
+        """
+        measure() is called without arguments when the key is missing.
+        It has to return the (width, height) extent.
+        """
+        return super().get(key, measure)
+
+
+
+def text_key(text, dpi):
+    """
+    Key of a matplotlib.text.Text instance: its string, font
+    properties, rotation and the figure dpi.
+    """
+    return (text.get_text(),
+            # Font properties are mutable.
+            text.get_fontproperties().copy(),
+            text.get_rotation(),
+            text.get_usetex(),
+            dpi)
+
+
+def legend_key(legend, dpi):
+    """
+    Key of a matplotlib.legend.Legend instance. The legend layout
+    parameters set by Bars are constant.
+    """
+    return ('legend',
+            tuple(text_key(t, dpi) for t in legend.get_texts()),
+            text_key(legend.get_title(), dpi))
+
+
+
+text_extent_cache = ExtentCache()
+
+
+if hasattr(os, 'register_at_fork'): # Not on Windows.
+    os.register_at_fork(after_in_child = text_extent_cache._reset_lock)
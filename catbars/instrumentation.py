@@ -0,0 +1,130 @@
+"""
+Instrumentation.
+
+An instrumented Bars instance records the wall time of the phases of
+its construction in "Bars.timings" (seconds, accumulated over
+update() calls) and counts its figure drawings and text measurements
+in "Bars.counts". Instrumentation is enabled per chart by the
+"instrumented" configuration parameter and for every chart as long as
+a hook is registered:
+
+    import catbars
+
+    def send(bars, event):
+        for phase, seconds in bars.timings.items():
+            metrics.timing('catbars.' + phase, seconds)
+
+    catbars.hooks.add(send)
+
+Hooks are called with the chart and the name of the event which has
+just completed: 'model', 'figure', 'update' or 'encode' (SEE EVENTS).
+"""
+from functools import wraps
+import logging
+import os
+import threading
+import time
+
+
+logger = logging.getLogger(__name__)
+
+
+PHASES = ['model',
+          'figure',
+          'title',
+          'left_labels',
+          'ylabel',
+          'legend',
+          'right_labels',
+          'right_label_layout',
+          'x_ticklabels',
+          'xlabel',
+          'draw',
+          'encode',
+          'update']
+
+
+EVENTS = ['model', 'figure', 'update', 'encode']
+
+
+COUNTS = ['draws', 'text_measurements']
+
+
+class HookRegistry:
+    """
+    Process-wide callbacks called with (bars, event) by instrumented
+    charts. A failing hook is logged and doesn't interrupt the chart.
+    """
+
+    def __init__(self):
+        self._hooks = []
+        self._lock = threading.Lock()
+
+
+    def _reset_lock(self):
+        """
+        Called in a forked child (the lock may have been held by
+        another thread of the parent).
+        """
+        self._lock = threading.Lock()
+
+
+    def add(self, hook):
+        with self._lock:
+            if hook not in self._hooks:
+                self._hooks.append(hook)
+
+
+    def remove(self, hook):
+        with self._lock:
+            self._hooks.remove(hook)
+
+
+    def clear(self):
+        with self._lock:
+            self._hooks.clear()
+
+
+    def notify(self, bars, event):
+        with self._lock:
+            hooks = list(self._hooks)
+        for hook in hooks:
+            try:
+                hook(bars, event)
+            except Exception:
+                logger.exception('The hook %r failed (%s event).',
+                                 hook,
+                                 event)
+
+
+    def __len__(self):
+        return len(self._hooks)
+
+
+
+def timed(phase):
+    """
+    Decorator of Bars methods: the wall time of the call is added to
+    "timings[phase]" if the chart is instrumented.
+    """
+    def decorator(method):
+        @wraps(method)
+        def wrapper(self, *args, **kwargs):
+            if not self._instrumented:
+                return method(self, *args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return method(self, *args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - start
+                self.timings[phase] = self.timings.get(phase, 0.0) + elapsed
+        return wrapper
+    return decorator
+
+
+
+hooks = HookRegistry()
+
+
+if hasattr(os, 'register_at_fork'): # Not on Windows.
+    os.register_at_fork(after_in_child = hooks._reset_lock)
@@ -0,0 +1,63 @@
+"""
+Layout templates.
+
+The constraint solving for the title, the left labels, the ylabel
+and the legend only depends on the configuration, the figure size,
+the titles, the left labels and the legend entries. Its result can
+be exported with Bars.get_layout_template() and passed to the
+constructor of a new chart (keyword argument "layout_template") to
+skip it.
+
+The right labels and the x tick labels depend on "numbers": they
+are always solved. Hence, a chart built with a template is identical
+to a chart built from scratch.
+
+The process-wide layout cache stores templates automatically. It is
+keyed by a hash of the layout-relevant inputs and is disabled by
+default. It is enabled by giving it a size:
+
+    import catbars
+    catbars.layout_cache.resize(128)
+
+"""
+import os
+
+from .caches import LRUCache
+
+
+TEMPLATE_KEYS = ['x0', 'y0', 'width', 'height', 'legend_width']
+
+
+class LayoutCache(LRUCache):
+    """
+    A size-bounded LRU cache mapping layout keys
+    (SEE Bars._get_layout_key()) to layout templates, the dicts
+    returned by Bars.get_layout_template() (SEE
+    catbars.caches.LRUCache).
+
+    Parameters
+    -----------
+    maxsize : int, optional
+        The maximum number of templates kept in memory. The cache is
+        disabled if maxsize is 0 (default value).
+    """
+
+
+def validate_layout_template(layout_template):
+    try:
+        for key in TEMPLATE_KEYS:
+            float(layout_template[key])
+    except Exception:
+        text = """
+"layout_template" has to define five numbers: 'x0', 'y0', 'width',
+'height' and 'legend_width' (SEE Bars.get_layout_template()).
+"""
+        raise TypeError(text.strip())
+
+
+
+layout_cache = LayoutCache()
+
+
+if hasattr(os, 'register_at_fork'): # Not on Windows.
+    os.register_at_fork(after_in_child = layout_cache._reset_lock)
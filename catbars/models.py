@@ -1,9 +1,18 @@
 import math
+import copy
 from collections import Counter
+import itertools
 from abc import ABC, abstractmethod
 import pprint
 import logging
 
+import numpy as np
+
+
+# Number of elements processed at a time by reductions.
+# A chunk of floats stays in the CPU cache.
+CHUNK_SIZE = 1 << 15
+
 
 
 class ModelFactory:
@@ -13,8 +22,13 @@ class ModelFactory:
         
         global_view = kwargs['global_view']
         del kwargs['global_view']
+        overview = kwargs.pop('overview', None)
         
-        if global_view is True:
+        if overview is not None:
+            self.model = OverviewModel(numbers,
+                                       aggregate = overview,
+                                       **kwargs)
+        elif global_view is True:
             self.model = GlobalViewModel(numbers,
                                          **kwargs)
         else:
@@ -36,7 +50,8 @@ class AbstractModel(ABC):
                  default_label = 'else',
                  color_dic = None,
                  default_color = 'black',
-                 tints = []):
+                 tints = [],
+                 summary = None):
 
 
         
@@ -47,19 +62,23 @@ class AbstractModel(ABC):
         self.right_labels = right_labels
         self.colors = colors
         
-        # The following three attributes work together.
-        # 0, 1, 2 and 3 are both indices and implicit identifiers.
         self._features = ['numbers',
                           'left_labels',
                           'right_labels',
-                          'colors'] # Pointers.
-        self._feature_indices = [None,
-                                 None,
-                                 None,
-                                 None]
-        self._actual_features = []    
+                          'colors']
+        # Sorting, slicing and reversing compose an index array
+        # of the rows. None stands for all the rows in input order.
+        self._order = None
+        # One-based ranks of the current rows ("rank" option).
+        self._ranks = None
+        # While "_top_k" is set, "_order" only indexes the first
+        # "_top_k" rows of the sorted dataset (SEE _select_top_rows()).
+        self._top_k = None
         
         self._color_dic = color_dic
+        # Statistics of a dataset whose first rows are the features
+        # (SEE catbars.streams).
+        self._summary = summary
         self._tints = tints
         self._default_label = default_label
         self._slice = slice
@@ -72,7 +91,18 @@ class AbstractModel(ABC):
         self.actual_colors = None
         self.legend_colors = None
         self.legend_labels = None
+        self._translator = None
+        # (codes, categories) of "colors" when all the rows are
+        # counted (SEE factorize()).
+        self._color_codes = None
+        self._category_counts = None
+        # Counter of the "colors" categories (SEE _get_color_dic()).
+        self._category_counter = None
         self.spread = None
+        self._sum = None
+        # Minimum, maximum and sum of "numbers" (SEE min_max_sum()).
+        # Reused as long as the set of numbers is unchanged.
+        self._reduction = None
         
         
 
@@ -146,16 +176,23 @@ Feature containers have to be the same length and implement __len__.
 
 
     def _validate_numbers(self):
-        i = 0
-        for x in self.numbers:
-            x = float(x)
-            if x < 0:
-                text = """
-Supplied numbers have to be non-negative.
-({} at the zero-based position {}). 
-""".format(x, i)
-                raise ValueError(text.strip())
-            i += 1
+        """
+        Numeric ndarrays (including memory-mapped ones) and Series are
+        used without copying. The numbers of the displayed rows are
+        converted to floats (SEE _take_features()). Other containers
+        are converted to a float array.
+        """
+        numbers = np.asarray(self.numbers)
+        if numbers.dtype.kind not in 'iuf':
+            numbers = np.asarray(self.numbers, dtype = float)
+        if numbers.ndim != 1 or len(numbers) == 0:
+            text = """
+Supplied numbers have to be a non-empty one-dimensional container.
+"""
+            raise ValueError(text.strip())
+        self._reduction = min_max_sum(numbers)
+        check_numbers(numbers, self._reduction)
+        self.numbers = numbers
 
 
     def _validate_slice(self):
@@ -170,36 +207,33 @@ Supplied numbers have to be non-negative.
 
     def _building_routine(self):
         
-        self._set_actual_features()
-        
-        if self._sort_option:
-            self._actual_features = self._sort(
-                                 self._actual_features)
-            self._update_features()
-            self.minimum = self.numbers[-1]
-            self.maximum = self.numbers[0]
-        else:
-            self._update_features()
-            self.minimum = min(self.numbers)
-            self.maximum = max(self.numbers)
+        if self._sort_option and self._top_k is not None:
+            self._order = self._select_top_rows(self._top_k)
+        elif self._sort_option:
+            self._order = self._sort(self._order)
+        if self._summary is not None:
+            self._reduction = self._summary.reduction
+        if self._reduction is None:
+            self._reduction = min_max_sum(self._get_rows('numbers'))
+        (self.minimum,
+         self.maximum,
+         self._sum) = self._reduction
         
         
         self._set_spread([self.minimum,
                           self.maximum])
 
         
-            
-        if not self._is_a_container(self.left_labels):
-            self.left_labels = self._get_automatic_labels(
-                self.left_labels)
-            
-        if not self._is_a_container(self.right_labels):
-            self.right_labels = self._get_automatic_labels(
-                self.right_labels)
+        # Automatic labels are materialized at the end (SEE
+        # _take_features()). They are based on the current rows.
+        self._ranks = range(1, self._count_rows() + 1)
         
         
         
         if self.colors is not None:
+            if (self._summary is None and
+                (self._order is None or self._top_k is not None)):
+                self._color_codes = factorize(self.colors)
             if self._color_dic is not None:
                 self._set_colors(self._color_dic)
             else:
@@ -209,40 +243,178 @@ Supplied numbers have to be non-negative.
         
 
 
-    def _set_actual_features(self):
-        """
-        Feature containers are copied, joined and
-        are ready to be sorted.
-        """
-        for i, feature_name in enumerate(self._features):
-            feature = getattr(self, feature_name)
-            if (feature is not None and 
-                not isinstance(feature, str)):
-                
-                new_feature = list(feature) # Copying.
-                self._feature_indices[i] = len(self._actual_features)
-                self._actual_features.append(new_feature)
+    def _count_rows(self):
+        if self._order is None or self._top_k is not None:
+            return self.length
+        return len(self._order)
 
 
-
-    def _update_features(self):
-        for i, feature_name in enumerate(self._features):
-            j = self._feature_indices[i]
-            if j is not None:
-                setattr(self,
-                        feature_name,
-                        self._actual_features[j])
-    
-
-    def _sort(self, features):
-        tuples = list(zip(*features))
-        sorted_tuples = sorted(tuples,
-                               reverse = True)
-        processed_features = [list(feature) for feature
-                              in zip(*sorted_tuples)]
-        return processed_features
+    def _get_rows(self, feature_name):
+        """
+        The values of a feature container for the current rows. The
+        container itself is returned while no index is defined or
+        while only the top rows are indexed (the rows are then in
+        input order).
+        Other features than "numbers" are returned as an iterator
+        (the rows are taken chunk by chunk).
+        """
+        feature = getattr(self, feature_name)
+        if self._order is None or self._top_k is not None:
+            return feature
+        if feature_name == 'numbers':
+            return feature[self._order]
+        if not is_indexable(feature):
+            feature = list(feature)
+        return itertools.chain.from_iterable(
+            take(feature, self._order[i:i + CHUNK_SIZE])
+            for i in range(0, len(self._order), CHUNK_SIZE))
+
+
+    def _sort(self, order):
+        """
+        The indices of the rows sorted in descending order.
+        As when sorting tuples of features, ties between numbers
+        are broken by the other features. Only the tied rows are
+        compared in Python.
+        """
+        if order is None:
+            numbers = self.numbers
+        else:
+            numbers = self.numbers[order]
+        # Stable sort in descending order: tied rows keep their
+        # relative order.
+        permutation = np.argsort(numbers[::-1], kind = 'stable')[::-1]
+        np.subtract(len(numbers) - 1, permutation, out = permutation)
+        if order is None:
+            order = permutation
+        else:
+            order = order[permutation]
+
+        others = [getattr(self, name) for name in self._features[1:]
+                  if self._is_a_container(getattr(self, name))]
+        if not others or len(order) < 2:
+            return order
+
+        numbers = numbers[permutation]
+
+        # Row i is tied with row i + 1.
+        ties = np.flatnonzero(numbers[1:] == numbers[:-1])
+        if len(ties) == 0:
+            return order
+        others = [feature if is_indexable(feature) else list(feature)
+                  for feature in others]
+        # Runs of consecutive ties are groups of tied rows.
+        breaks = (np.diff(ties) != 1)
+        starts = ties[np.concatenate(([True], breaks))]
+        ends = ties[np.concatenate((breaks, [True]))] + 2
+        for a, b in zip(starts.tolist(), ends.tolist()):
+            group = order[a:b]
+            keys = list(zip(*[take(feature, group)
+                              for feature in others]))
+            ranks = sorted(range(len(group)),
+                           key = keys.__getitem__,
+                           reverse = True)
+            order[a:b] = group[ranks]
+        return order
     
     
+    def _select_top_rows(self, k):
+        """
+        The indices of the first k rows of the sorted dataset
+        (SEE _sort()), in O(n + k log k). Only the rows greater than
+        or equal to the k-th largest number are sorted.
+        """
+        numbers = self.numbers
+        threshold = kth_largest(numbers, k)
+        # The rows equal to the threshold are all kept: ties are
+        # broken by _sort(). "numbers" is read chunk by chunk (it may
+        # be memory-mapped).
+        above = []
+        tied = []
+        for start in range(0, len(numbers), CHUNK_SIZE):
+            chunk = numbers[start:start + CHUNK_SIZE]
+            above.append(np.flatnonzero(chunk > threshold) + start)
+            tied.append(np.flatnonzero(chunk == threshold) + start)
+        candidates = np.concatenate(above + tied)
+        return self._sort(candidates)[:k]
+
+
+    def _count_categories(self):
+        """
+        The counter of the "colors" categories in order of first
+        appearance in the current rows. Counter.most_common() keeps
+        this order for equal counts.
+        """
+        if self._summary is not None:
+            return self._summary.categories
+        if self._color_codes is not None:
+            return self._count_codes()
+        if self._top_k is None:
+            return Counter(self._get_rows('colors'))
+
+        # Only the top rows are sorted: the categories are counted
+        # in input order and the categories with equal counts are
+        # ordered by their first row in the sorted dataset. More top
+        # rows are selected until each of them has been found.
+        counter = Counter(self.colors)
+        multiplicities = Counter(counter.values())
+        tied = {category for category, count in counter.items()
+                if multiplicities[count] > 1}
+        positions = dict()
+        order = self._order
+        start = 0
+        while True:
+            for i, category in enumerate(take(self.colors, order[start:]),
+                                         start):
+                if category in tied and category not in positions:
+                    positions[category] = i
+            if len(positions) == len(tied) or len(order) == self.length:
+                break
+            start = len(order)
+            order = self._select_top_rows(min(4 * len(order),
+                                              self.length))
+        return Counter(dict(sorted(
+            counter.items(),
+            key = lambda e: (-e[1], positions.get(e[0], 0)))))
+
+
+    def _count_codes(self):
+        """
+        SEE _count_categories(). The categories are counted with
+        bincount and ordered by decreasing count, then by first
+        appearance.
+        """
+        codes, categories = self._color_codes
+        counts = self._get_category_counts()
+        if self._top_k is None:
+            positions = first_positions(codes, counts > 0)
+        else:
+            # SEE the Counter version above.
+            values, multiplicities = np.unique(counts,
+                                               return_counts = True)
+            tied = ((counts > 0) &
+                    (multiplicities[np.searchsorted(values, counts)] > 1))
+            order = self._order
+            while True:
+                positions = first_positions(codes.take(order), tied)
+                if ((positions[tied] >= 0).all() or
+                    len(order) == self.length):
+                    break
+                order = self._select_top_rows(min(4 * len(order),
+                                                  self.length))
+            positions[~tied] = 0
+        present = np.flatnonzero(counts).tolist()
+        present.sort(key = lambda c: (-counts[c], positions[c]))
+        return Counter({categories[c] : int(counts[c]) for c in present})
+
+
+    def _get_category_counts(self):
+        if self._category_counts is None:
+            codes, categories = self._color_codes
+            self._category_counts = count_codes(codes, len(categories))
+        return self._category_counts
+
+
     def _get_automatic_labels(self, option):
         """
         The otpional feature remains unchanged if its value
@@ -250,13 +422,12 @@ Supplied numbers have to be non-negative.
         """
         labels = None
         if option == 'rank':
-            labels = [str(i) for i
-                      in range(1, self.length + 1)]
+            labels = [str(i) for i in self._ranks]
         elif option == 'proportion':
             # "proportion" is based on the whole dataset.
-            numbers_sum =  sum(self.numbers)
+            numbers_sum = self._sum
             labels = [self._format_perc(x / numbers_sum)
-                      for x in self.numbers]
+                      for x in self.numbers.tolist()]
         return labels
     
     
@@ -280,7 +451,8 @@ Supplied numbers have to be non-negative.
 
 
     def _get_color_dic(self):
-        counter = (Counter(self.colors))
+        counter = self._count_categories()
+        self._category_counter = counter
         tints_count = len(self._tints)
         categories_count = len(counter)
         too_many_categories = (categories_count > tints_count)
@@ -297,30 +469,36 @@ Supplied numbers have to be non-negative.
     
     def _set_colors(self,
                     color_dic):
-
-        actual_colors = []
+        """
+        The legend is based on the current rows. The actual colors
+        are materialized at the end (SEE _take_features()).
+        """
         legend_colors = []
         legend_labels = [] 
-        too_many_categories = False
-        # actual_colors
-        for i, category in enumerate(self.colors):
-            if category in color_dic:
-                c = color_dic[category]
-                actual_colors.append(c)
-            else:
-                # Residual categories are associated
-                # with self.tints[-1] by default.
-                actual_colors.append(self.default_color)
-                too_many_categories = True
+        if self._summary is not None:
+            categories = self._summary.categories
+        elif self._category_counter is not None:
+            # The rows are not read again.
+            categories = self._category_counter
+        elif self._color_codes is not None:
+            _, all_categories = self._color_codes
+            categories = [all_categories[c] for c in np.flatnonzero(
+                              self._get_category_counts())]
+        else:
+            categories = dict.fromkeys(self._get_rows('colors'))
+        too_many_categories = any(category not in color_dic
+                                  for category in categories)
         
         for unique_category in sorted(color_dic.keys()):
             legend_labels.append(unique_category)
             legend_colors.append(color_dic[unique_category])
         if too_many_categories:
+            # Residual categories are associated
+            # with self.default_color.
             legend_labels.append(self._default_label)
             legend_colors.append(self.default_color)
 
-        self.actual_colors = actual_colors
+        self._translator = color_dic
         self.legend_colors = legend_colors
         self.legend_labels = legend_labels
         
@@ -330,30 +508,65 @@ Supplied numbers have to be non-negative.
         Slicing.
         """
         start, end = self._slice
-        for name in [*self._features,
-                      'actual_colors']:
-            feature = getattr(self, name)
-            if self._is_a_container(feature):
-                feature = list(feature)
-                setattr(self,
-                        name,
-                        feature[start-1:end])
-        self.length = len(self.numbers)
+        self._reduction = None
+        self._top_k = None
+        if self._order is None:
+            rows = range(self.length)[start-1:end]
+            self._order = np.arange(rows.start, rows.stop, rows.step)
+        else:
+            self._order = self._order[start-1:end]
+        if self._ranks is not None:
+            self._ranks = self._ranks[start-1:end]
 
 
     def _reverse(self):
         """
         The data is adapted to Matplotlib.
         """
-        for feature_name in [*self._features,
-                             'actual_colors']:
-            feature = getattr(self,
-                              feature_name)
-            if self._is_a_container(feature):
-                reversed_feature = list(reversed(feature))
+        if self._order is None:
+            self._order = np.arange(self.length)
+        self._order = self._order[::-1]
+        self._ranks = self._ranks[::-1]
+
+
+    def _take_features(self):
+        """
+        The composed index (sorting, slicing and reversing) is applied
+        once to each feature: only the displayed rows are copied.
+        """
+        order = self._order
+        for feature_name in self._features:
+            feature = getattr(self, feature_name)
+            if feature_name == 'numbers':
+                setattr(self,
+                        feature_name,
+                        np.asarray(feature[order], dtype = float))
+            elif self._is_a_container(feature):
                 setattr(self,
                         feature_name,
-                        reversed_feature)
+                        take(feature, order))
+        self.length = len(order)
+
+        for feature_name in ['left_labels', 'right_labels']:
+            option = getattr(self, feature_name)
+            if not self._is_a_container(option):
+                setattr(self,
+                        feature_name,
+                        self._get_automatic_labels(option))
+
+        if self._color_codes is not None:
+            # Palette gather.
+            codes, categories = self._color_codes
+            palette = np.array([self._translator.get(category,
+                                                     self.default_color)
+                                for category in categories] + [None],
+                               dtype = object)
+            self.actual_colors = palette[
+                normalize_codes(codes.take(order), categories)].tolist()
+        elif self.colors is not None:
+            self.actual_colors = [
+                self._translator.get(category, self.default_color)
+                for category in self.colors]
 
 
     def __str__(self):
@@ -365,10 +578,203 @@ Supplied numbers have to be non-negative.
 
 
 
+def is_indexable(feature):
+    """
+    Positional indexing: sequences and containers implementing take()
+    (NumPy arrays, pandas objects and catbars.columns.CodedColumn).
+    """
+    return (isinstance(feature, (list, tuple, range)) or
+            hasattr(feature, 'take'))
+
+
+def take(feature, indices):
+    """
+    The elements of a feature container at the given positions
+    (an integer array), as a list. The elements are the ones
+    the container yields when iterated.
+    """
+    if hasattr(feature, 'take'):
+        return list(feature.take(indices))
+    if not is_indexable(feature):
+        feature = list(feature)
+    return [feature[i] for i in indices.tolist()]
+
+
+def factorize(feature):
+    """
+    Integer codes and categories of a "colors" container, or None if
+    its elements have to be counted in Python. The codes of
+    catbars.columns.CodedColumn and pandas categorical containers are
+    reused. Arrays of booleans, integers and strings are factorized
+    with np.unique(). pandas objects of Python objects are factorized
+    with their factorize() method. A negative code stands for NaN (the
+    last category).
+    """
+    if hasattr(feature, 'cat'):
+        # pandas categorical Series.
+        feature = feature.cat
+    if hasattr(feature, 'codes') and hasattr(feature, 'categories'):
+        codes = np.asarray(feature.codes)
+        categories = list(feature.categories)
+        if len(codes) > 0 and codes.min() < 0:
+            categories.append(np.nan)
+        return codes, categories
+
+    kind = getattr(getattr(feature, 'dtype', None), 'kind', None)
+    if kind is not None and kind in 'biuUS':
+        categories, codes = np.unique(np.asarray(feature),
+                                      return_inverse = True)
+        return codes, list(categories)
+    if kind == 'O' and hasattr(feature, 'factorize'):
+        codes, categories = feature.factorize()
+        if len(codes) > 0 and codes.min() < 0:
+            # NaN would be dropped.
+            return None
+        return codes, list(categories)
+    return None
+
+
+def encode(feature):
+    """
+    Integer codes and categories of any "colors" container (SEE
+    factorize()). Elements which can't be factorized are coded in
+    order of first appearance.
+    """
+    factorized = factorize(feature)
+    if factorized is not None:
+        return factorized
+    index = dict()
+    codes = np.fromiter((index.setdefault(x, len(index)) for x in feature),
+                        dtype = np.int64,
+                        count = len(feature))
+    return codes, list(index)
+
+
+def normalize_codes(codes, categories):
+    """
+    Negative codes (NaN) are replaced by the last code.
+    """
+    if len(codes) > 0 and codes.min() < 0:
+        return np.where(codes < 0, len(categories) - 1, codes)
+    return codes
+
+
+def count_codes(codes, n, chunk_size = CHUNK_SIZE):
+    """
+    The number of occurrences of each of the n codes (bincount).
+    """
+    counts = np.zeros(n, dtype = np.int64)
+    categories = range(n)
+    for start in range(0, len(codes), chunk_size):
+        chunk = normalize_codes(codes[start:start + chunk_size],
+                                categories)
+        counts += np.bincount(chunk, minlength = n)
+    return counts
+
+
+def first_positions(codes, wanted, chunk_size = CHUNK_SIZE):
+    """
+    The position of the first occurrence of the codes for which the
+    boolean array "wanted" is True (-1 for the others). The scan
+    stops once they have all been found.
+    """
+    n = len(wanted)
+    positions = np.full(n, -1, dtype = np.int64)
+    remaining = int(np.count_nonzero(wanted))
+    categories = range(n)
+    for start in range(0, len(codes), chunk_size):
+        if remaining == 0:
+            break
+        chunk = normalize_codes(codes[start:start + chunk_size],
+                                categories)
+        values, indices = np.unique(chunk, return_index = True)
+        new = wanted[values] & (positions[values] < 0)
+        positions[values[new]] = indices[new] + start
+        remaining -= int(np.count_nonzero(new))
+    return positions
+
+
+def check_numbers(numbers, reduction, start = 0):
+    """
+    ValueError is raised if a number is NaN or negative. "reduction"
+    is the min_max_sum() of "numbers" and "start" is the position of
+    numbers[0] in the dataset.
+    """
+    minimum, _, __ = reduction
+    if math.isnan(minimum):
+        i = find_first(numbers, np.isnan)
+        text = """
+Supplied numbers can't be NaN (zero-based position {}).
+""".format(start + i)
+        raise ValueError(text.strip())
+    if minimum < 0:
+        i = find_first(numbers, lambda chunk: chunk < 0)
+        text = """
+Supplied numbers have to be non-negative.
+({} at the zero-based position {}). 
+""".format(numbers[i], start + i)
+        raise ValueError(text.strip())
+
+
+def find_first(numbers, predicate, chunk_size = CHUNK_SIZE):
+    """
+    The position of the first number for which the vectorized
+    "predicate" is True (None if there isn't any).
+    """
+    for start in range(0, len(numbers), chunk_size):
+        positions = np.flatnonzero(predicate(numbers[start:start + chunk_size]))
+        if len(positions) > 0:
+            return start + int(positions[0])
+    return None
+
+
+def kth_largest(numbers, k, chunk_size = CHUNK_SIZE):
+    """
+    The k-th largest number. The array is read chunk by chunk and
+    memory is O(k + chunk_size).
+    """
+    best = numbers[:0]
+    for start in range(0, len(numbers), chunk_size):
+        candidates = np.concatenate((best,
+                                     numbers[start:start + chunk_size]))
+        if len(candidates) > k:
+            candidates = np.partition(candidates,
+                                      len(candidates) - k)[-k:]
+        best = candidates
+    return best.min()
+
+
+def min_max_sum(numbers, chunk_size = CHUNK_SIZE):
+    """
+    Minimum, maximum and sum of a numeric array, computed in a single
+    pass over memory: each chunk is reduced three times while it is
+    in the CPU cache. NaN values propagate to the minimum and the
+    maximum. The sum is accumulated in double precision.
+    """
+    minimum = np.inf
+    maximum = -np.inf
+    total = 0.0
+    for start in range(0, len(numbers), chunk_size):
+        chunk = numbers[start:start + chunk_size]
+        minimum = np.minimum(minimum, chunk.min())
+        maximum = np.maximum(maximum, chunk.max())
+        total += chunk.sum(dtype = float)
+    return float(minimum), float(maximum), float(total)
+
+
+
+
 class GlobalViewModel(AbstractModel):
     
     def build(self):
         
+        if (self._sort_option and
+            self._slice is not None and
+            self._slice[0] >= 1 and
+            0 < self._slice[1] < self.length):
+            # Only the rows up to the end of the slice are sorted.
+            self._top_k = self._slice[1]
+        
         self._building_routine()
         
         if self._slice is not None:
@@ -376,6 +782,26 @@ class GlobalViewModel(AbstractModel):
 
         self._reverse()
 
+        self._take_features()
+
+
+    def pages(self, page_size, first = 1):
+        """
+        Generator of the models of consecutive slices of "page_size"
+        rows (the last one may be shorter), from the one-based row
+        "first". It replaces build(): the rows are sorted and the
+        global statistics and the color dictionary are computed once.
+        Each page only takes its own rows.
+        """
+        self._building_routine()
+        for start in range(first, self.length + 1, page_size):
+            page = copy.copy(self)
+            page._slice = (start, min(start + page_size - 1, self.length))
+            page._cut()
+            page._reverse()
+            page._take_features()
+            yield page
+
 
 
 class BasicModel(AbstractModel):
@@ -390,4 +816,159 @@ class BasicModel(AbstractModel):
         
         self._reverse()
 
+        self._take_features()
+
+
+
+class OverviewModel(AbstractModel):
+    """
+    Overview of a whole sorted dataset. Consecutive rows are
+    aggregated into at most "bins" bars: their maximum, mean or sum
+    ("aggregate"). Each bar is colored by the most common "colors"
+    category of its rows. Only the bars containing the one-based
+    "anchors" ranks are labeled (SEE the "overview" option of Bars).
+    Labeled bars are at least "anchor_gap" bars apart.
+    """
+
+    AGGREGATES = ['max', 'mean', 'sum']
+
+    def __init__(self,
+                 numbers,
+                 aggregate = 'max',
+                 bins = 400,
+                 anchors = None,
+                 anchor_gap = 1,
+                 **kwargs):
+
+        super().__init__(numbers, **kwargs)
+        self._aggregate = aggregate
+        self._bins = bins
+        self._anchor_ranks = anchors
+        self._anchor_gap = anchor_gap
+        # (position, text) of the labeled bars.
+        self.anchors = None
+        self._validate_overview()
+
 
+    def _validate_overview(self):
+        if self._aggregate not in self.AGGREGATES:
+            text = """
+The "overview" aggregate has to be 'max', 'mean' or 'sum'.
+"""
+            raise ValueError(text.strip())
+        if self._sort_option is not True:
+            raise ValueError('An overview requires "sort" to be True.')
+        for name, value in [('slice', self._slice),
+                            ('right_labels', self.right_labels)]:
+            if value is not None:
+                text = """
+"{}" can't be used with an overview.
+""".format(name)
+                raise ValueError(text.strip())
+        if self.left_labels == 'proportion':
+            # Anchor labels are ranks or "left_labels" items.
+            text = """
+"left_labels" can't be 'proportion' with an overview.
+"""
+            raise ValueError(text.strip())
+        if self._anchor_ranks is not None:
+            for rank in self._anchor_ranks:
+                if (not isinstance(rank, (int, np.integer)) or
+                    not 1 <= rank <= self.length):
+                    text = """
+"anchors" have to be one-based ranks between 1 and {}.
+""".format(self.length)
+                    raise ValueError(text.strip())
+
+
+    def build(self):
+
+        self._building_routine()
+
+        self._bin()
+
+
+    def _bin(self):
+        """
+        Aggregation of the sorted rows. The bars are reversed for
+        Matplotlib.
+        """
+        order = self._order
+        n = self.length
+        bins = min(self._bins, n)
+        # Bin i contains the rows edges[i] to edges[i + 1] - 1.
+        edges = (np.arange(bins + 1) * n) // bins
+        starts = edges[:-1]
+        numbers = self.numbers[order]
+        if self._aggregate == 'max':
+            values = np.asarray(numbers[starts], dtype = float)
+        else:
+            values = np.add.reduceat(numbers, starts, dtype = float)
+            if self._aggregate == 'mean':
+                values /= np.diff(edges)
+
+        if self.colors is not None:
+            codes, categories = encode(self.colors)
+            codes = normalize_codes(codes.take(order), categories)
+            dominant = []
+            for a, b in zip(starts.tolist(), edges[1:].tolist()):
+                # Ties: the first code.
+                present, counts = np.unique(codes[a:b],
+                                            return_counts = True)
+                dominant.append(categories[present[counts.argmax()]])
+            self.colors = dominant[::-1]
+            self.actual_colors = [
+                self._translator.get(category, self.default_color)
+                for category in self.colors]
+
+        self.anchors = [(bins - 1 - position, text) for position, text
+                        in self._get_anchors(edges)]
+        self.left_labels = None
+        self.numbers = values[::-1]
+        self.length = bins
+        self._order = None
+        self.minimum = float(values.min())
+        self.maximum = float(values.max())
+        self._set_spread([self.minimum,
+                          self.maximum])
+
+
+    def _get_anchors(self, edges):
+        """
+        (bin, text) pairs. The text is the rank ("left_labels" is None
+        or 'rank') or, if "left_labels" is a container, the label of the
+        row of that rank. Anchors
+        closer than "anchor_gap" bars to a previous one are dropped.
+        """
+        ranks = self._anchor_ranks
+        if ranks is None:
+            ranks = get_default_anchors(self.length)
+        ranks = sorted(set(int(rank) for rank in ranks))
+        positions = np.searchsorted(edges, np.array(ranks) - 1,
+                                    side = 'right') - 1
+        if self._is_a_container(self.left_labels):
+            texts = [str(label) for label in take(
+                         self.left_labels,
+                         self._order[np.array(ranks) - 1])]
+        else:
+            texts = [str(rank) for rank in ranks]
+        anchors = []
+        for position, text in zip(positions.tolist(), texts):
+            if (not anchors or
+                position - anchors[-1][0] >= self._anchor_gap):
+                anchors.append((position, text))
+        return anchors
+
+
+def get_default_anchors(n, count = 10):
+    """
+    The rank 1 and the multiples of a round step (1, 2 or 5 times a
+    power of 10) up to n, with at most "count" multiples.
+    """
+    step = 1
+    while n // step > count:
+        for factor in [2, 5, 10]:
+            if n // (step * factor) <= count or factor == 10:
+                step *= factor
+                break
+    return sorted({1, *range(step, n + 1, step)})
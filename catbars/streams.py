@@ -0,0 +1,184 @@
+"""
+Streaming inputs.
+
+Bars.from_iterable() and Bars.from_csv() read the rows of a dataset
+chunk by chunk. Only the rows which can be displayed are kept:
+
+- the first "end" rows of the sorted dataset if "sort" is True
+  (a bounded heap), or
+- the first "end" rows in input order otherwise,
+
+where slice = (start, end). For a global view, the minimum, maximum
+and sum of the numbers as well as the color category counts are
+computed on the fly. Memory is then proportional to the slice and to
+the number of color categories, not to the number of rows. Without
+a slice, every row is kept.
+
+    from catbars import Bars
+
+    Bars.from_csv('companies.csv',
+                  numbers = 'cap',
+                  right_labels = 'name',
+                  colors = 'sector',
+                  sort = True,
+                  slice = (1, 30),
+                  global_view = True)
+
+"""
+from collections import Counter, namedtuple
+import csv
+import heapq
+import itertools
+import math
+
+import numpy as np
+
+from .models import CHUNK_SIZE, check_numbers, min_max_sum
+
+
+FEATURES = ['numbers',
+            'left_labels',
+            'right_labels',
+            'colors']
+
+
+StreamSummary = namedtuple('StreamSummary',
+                           ['length', 'reduction', 'categories'])
+StreamSummary.__doc__ = """
+Statistics of a whole dataset for a global view model built from its
+first rows. "reduction" is the (minimum, maximum, sum) of the numbers
+and "categories" is a Counter of the color categories (or None) in
+the order of first appearance in the dataset.
+"""
+
+
+def read_rows(rows,
+              columns,
+              sort = False,
+              slice = None,
+              global_view = False,
+              chunk_size = CHUNK_SIZE):
+    """
+    Streaming reduction of "rows".
+
+    Parameters
+    -----------
+    rows : iterable
+        Sequences or mappings.
+
+    columns : dict
+        Feature names (SEE FEATURES) to the keys of the rows. The
+        "numbers" key is mandatory.
+
+    sort, slice, global_view
+        SEE the Bars constructor.
+
+    chunk_size : int, optional
+        The number of rows processed at a time.
+
+    Returns
+    --------
+    (dict, StreamSummary)
+        The feature lists of the rows kept and, for a global view,
+        the summary of the whole dataset (None otherwise).
+    """
+    names = [name for name in FEATURES if name in columns]
+    keys = [columns[name] for name in names]
+    bounded = (slice is not None and slice[0] >= 1 and slice[1] >= 1)
+    keep = slice[1] if bounded else None # None: every row is kept.
+    # A basic model slices the rows in input order before sorting.
+    top = (global_view and sort and bounded)
+    color_index = (names.index('colors')
+                   if global_view and 'colors' in names else None)
+
+    kept = [] # Rows (tuples) in input order or heap of (row, -position).
+    length = 0
+    minimum, maximum, total = math.inf, -math.inf, 0.0
+    categories = Counter() if color_index is not None else None
+    first_rows = dict() # Categories to their first row once sorted.
+
+    rows = iter(rows)
+    while True:
+        chunk = list(itertools.islice(rows, chunk_size))
+        if not chunk:
+            break
+        values = [[row[key] for row in chunk] for key in keys]
+        numbers = np.asarray(values[0], dtype = float)
+        reduction = min_max_sum(numbers)
+        check_numbers(numbers, reduction, start = length)
+        minimum = min(minimum, reduction[0])
+        maximum = max(maximum, reduction[1])
+        total += reduction[2]
+        values[0] = numbers.tolist()
+        chunk_rows = list(zip(*values))
+
+        if categories is not None:
+            categories.update(values[color_index])
+            if sort:
+                for row in chunk_rows:
+                    category = row[color_index]
+                    if (category not in first_rows or
+                        row > first_rows[category]):
+                        first_rows[category] = row
+
+        if top:
+            _push(kept, chunk_rows, numbers, length, keep)
+        elif keep is None:
+            kept.extend(chunk_rows)
+        elif len(kept) < keep:
+            kept.extend(chunk_rows[:keep - len(kept)])
+        length += len(chunk)
+
+    if top:
+        # Descending order. Equal rows remain in input order.
+        kept = [row for row, _ in sorted(kept, reverse = True)]
+
+    features = {name : [row[i] for row in kept]
+                for i, name in enumerate(names)}
+    summary = None
+    if global_view:
+        if categories is not None and sort:
+            # Counter.most_common() keeps the order of first
+            # appearance in the sorted dataset for equal counts.
+            positions = {category : i for i, category in enumerate(
+                             sorted(first_rows,
+                                    key = first_rows.__getitem__,
+                                    reverse = True))}
+            categories = Counter(dict(sorted(
+                categories.items(),
+                key = lambda e: (-e[1], positions[e[0]]))))
+        summary = StreamSummary(length,
+                                (minimum, maximum, total),
+                                categories)
+    return features, summary
+
+
+def _push(heap, chunk_rows, numbers, start, k):
+    """
+    The k greatest rows are kept in a min-heap. Only the rows of
+    the chunk greater than or equal to the smallest kept number are
+    compared in Python.
+    """
+    candidates = range(len(chunk_rows))
+    if len(heap) == k:
+        candidates = np.flatnonzero(numbers >= heap[0][0][0]).tolist()
+    for i in candidates:
+        # Earlier rows win ties.
+        entry = (chunk_rows[i], -(start + i))
+        if len(heap) < k:
+            heapq.heappush(heap, entry)
+        elif entry > heap[0]:
+            heapq.heapreplace(heap, entry)
+
+
+def iter_csv(file_name, delimiter = ','):
+    """
+    Generator yielding the rows of a csv file (with a header) as dicts.
+    """
+    with open(file_name, newline = '') as f:
+        yield from csv.DictReader(f, delimiter = delimiter)
+
+
+def read_csv_header(file_name, delimiter = ','):
+    with open(file_name, newline = '') as f:
+        return next(csv.reader(f, delimiter = delimiter), [])
@@ -1,4 +1,5 @@
 import unittest
+from unittest import mock
 from os.path import abspath, exists
 import hashlib
 
@@ -111,6 +112,63 @@ The legend text can be very long""".strip()
 There is no existing hash for the figure.
 A new hash has been created""".strip()
             self.skipTest(text)
+
+
+class TestRightLabelSolver(unittest.TestCase):
+    """
+    The closed-form axes width against the bisection.
+    """
+    def setUp(self):
+        self.solved = []
+        solve = catbars.Bars._solve_right_label_width
+
+        def compare(bars, coeff_array, label_array):
+            w = solve(bars, coeff_array, label_array)
+            f = lambda x: max(x, max(coeff_array * x + label_array))
+            self.solved.append((w,
+                                bars._bisect_right_label_width(f),
+                                f(w),
+                                bars._width,
+                                bars.conf['right_label_solver_tolerance']))
+            return w
+
+        patcher = mock.patch.object(catbars.Bars,
+                                    '_solve_right_label_width',
+                                    autospec = True,
+                                    side_effect = compare)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_same_width(self):
+        numbers = [1, 10, 1000, 100000]
+        charts = [{'numbers' : [4, 1, 3, 2],
+                   'right_labels' : 'proportion'},
+                  {'numbers' : list(range(1, 40)),
+                   'right_labels' : [str(i) * 5 for i in range(39)]},
+                  {'numbers' : numbers,
+                   'right_labels' : ['label {}'.format(n) for n in numbers],
+                   'auto_scale' : True}]
+        for kwargs in charts:
+            with self.subTest(kwargs = kwargs):
+                self.solved.clear()
+                bars = catbars.Bars(**kwargs)
+                self.assertEqual(len(self.solved), 1)
+                w, bisected, f_w, width, tolerance = self.solved[0]
+                # The bisection returns a feasible lower bound.
+                self.assertGreaterEqual(w, bisected)
+                self.assertLessEqual(w - bisected, tolerance)
+                self.assertAlmostEqual(f_w, width)
+        self.assertEqual(bars.ax.get_xscale(), 'log')
+
+    def test_labels_already_fit(self):
+        # This case used to raise a NameError.
+        with mock.patch.object(catbars.Bars,
+                               '_bisect_right_label_width',
+                               autospec = True) as bisect:
+            bars = catbars.Bars([1, 100], right_labels = ['', ''])
+        self.assertEqual(self.solved, [])
+        bisect.assert_not_called()
+        self.assertEqual(len(bars._right_label_texts), 2)
         
         
 
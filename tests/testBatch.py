@@ -0,0 +1,85 @@
+import unittest
+from io import BytesIO
+import os
+import tempfile
+
+from catbars import Bars, render_many
+
+
+
+class Crash:
+    """
+    Kills the worker process unpickling it.
+    """
+    def __reduce__(self):
+        return (os._exit, (1,))
+
+
+
+class TestRenderMany(unittest.TestCase):
+    def setUp(self):
+        self.specs = [{'numbers' : [4, 1, 3, 2],
+                       'right_labels' : 'proportion',
+                       'title' : 'Chart {}'.format(i)}
+                      for i in range(4)]
+
+    def test_same_bytes(self):
+        expected = [Bars(**spec)._repr_png_()[0] for spec in self.specs]
+        results = list(render_many(self.specs, workers = 2))
+        self.assertEqual([r.index for r in results], [0, 1, 2, 3])
+        self.assertEqual([r.output for r in results], expected)
+
+    def test_isolated_failures(self):
+        specs = list(self.specs)
+        specs[1] = {'numbers' : [-1, 2]}
+        results = list(render_many(specs, workers = 2, ordered = False))
+        self.assertEqual(sorted(r.index for r in results), [0, 1, 2, 3])
+        for r in results:
+            with self.subTest(index = r.index):
+                if r.index == 1:
+                    self.assertIsNone(r.output)
+                    self.assertIn('ValueError', r.error)
+                else:
+                    self.assertIsNone(r.error)
+
+    def test_paths(self):
+        with tempfile.TemporaryDirectory() as d:
+            paths = [os.path.join(d, '{}.pdf'.format(i)) for i in range(4)]
+            results = list(render_many(self.specs,
+                                       format = 'pdf',
+                                       workers = 1,
+                                       paths = paths))
+            self.assertEqual([r.output for r in results], paths)
+            for path in paths:
+                self.assertTrue(os.path.getsize(path) > 0)
+
+    def test_file_objects(self):
+        expected = [Bars(**spec)._repr_png_()[0] for spec in self.specs]
+        buffers = [BytesIO() for _ in self.specs]
+        results = list(render_many(self.specs,
+                                   workers = 2,
+                                   paths = buffers))
+        self.assertEqual([r.error for r in results], [None] * 4)
+        self.assertEqual([r.output for r in results], buffers)
+        self.assertEqual([b.getvalue() for b in buffers], expected)
+
+    def test_worker_crash(self):
+        specs = [{'numbers' : [i + 1, 2]} for i in range(12)]
+        specs[5] = {'numbers' : [1, 2], 'title' : Crash()}
+        for ordered in [True, False]:
+            with self.subTest(ordered = ordered):
+                results = list(render_many(specs,
+                                           workers = 2,
+                                           ordered = ordered))
+                self.assertEqual(sorted(r.index for r in results),
+                                 list(range(12)))
+                for r in results:
+                    if r.index == 5:
+                        self.assertIsNone(r.output)
+                        self.assertIn('worker process', r.error)
+                    else:
+                        self.assertIsNone(r.error)
+                        self.assertTrue(len(r.output) > 0)
+
+if __name__ == '__main__':
+    unittest.main()
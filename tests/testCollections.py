@@ -0,0 +1,67 @@
+import unittest
+import numpy as np
+from matplotlib.collections import PolyCollection
+
+from catbars import Bars
+
+
+
+class TestBarCollection(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.RandomState(0)
+        n = 40
+        self.numbers = rng.rand(n) * 100
+        self.kwargs = {
+            'left_labels' : 'rank',
+            'right_labels' : 'proportion',
+            'colors' : ['c{}'.format(i % 5) for i in range(n)],
+            'line_dic' : {'number' : 50,
+                          'color' : 'red',
+                          'label' : 'line'},
+            'title' : 'Title',
+            'xlabel' : 'x'}
+        # Every chart is drawn as a collection.
+        self.collection_kwargs = dict(self.kwargs,
+                                      bar_collection_threshold = 1)
+
+    def get_pixels(self, bars):
+        return np.asarray(bars.canvas.buffer_rgba())
+
+    def test_artists(self):
+        bars = Bars(self.numbers, **self.collection_kwargs)
+        self.assertIsInstance(bars.bars, PolyCollection)
+        self.assertEqual(len(bars.ax.patches), 0)
+
+    def test_opt_in(self):
+        bars = Bars(np.ones(1000), lazy = True)
+        self.assertIsNone(bars.conf['bar_collection_threshold'])
+        self.assertFalse(bars._draws_bar_collection())
+        bars = Bars(np.ones(1000), lazy = True,
+                    bar_collection_threshold = 1000)
+        self.assertTrue(bars._draws_bar_collection())
+
+    def test_same_layout(self):
+        for kwargs in [{}, {'global_view' : True, 'slice' : (5, 30)}]:
+            with self.subTest(**kwargs):
+                a = Bars(self.numbers, **self.kwargs, **kwargs)
+                b = Bars(self.numbers, **self.collection_kwargs, **kwargs)
+                self.assertEqual(a.get_layout_template(),
+                                 b.get_layout_template())
+                self.assertEqual(a.ax.get_position().bounds,
+                                 b.ax.get_position().bounds)
+                self.assertEqual(a.ax.get_xlim(), b.ax.get_xlim())
+                self.assertEqual(a.ax.get_ylim(), b.ax.get_ylim())
+                # Antialiasing at the ends of some bars.
+                different = (self.get_pixels(a) !=
+                             self.get_pixels(b)).any(axis = -1)
+                self.assertLess(different.mean(), 0.005)
+
+    def test_update(self):
+        numbers = self.numbers[::-1] * 3
+        b = Bars(self.numbers, **self.collection_kwargs)
+        b.update(numbers)
+        expected, _ = Bars(numbers, **self.collection_kwargs)._repr_png_()
+        self.assertEqual(b._repr_png_()[0], expected)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,136 @@
+import unittest
+import os
+import tempfile
+import tracemalloc
+import numpy as np
+import pandas as pd
+
+import catbars
+import catbars.accessors
+from catbars import Bars
+from catbars.columns import CodedColumn, load_npz
+
+
+
+class TestFromFrame(unittest.TestCase):
+    def setUp(self):
+        self.df = pd.DataFrame({
+            'x' : [4., 1., 3., 2.],
+            'name' : ['d', 'a', 'c', 'b'],
+            'sector' : pd.Categorical(['DD', 'AA', 'DD', 'BB'])})
+        self.kwargs = {'sort' : True, 'title' : 'Title'}
+        self.expected, _ = Bars(list(self.df['x']),
+                                right_labels = list(self.df['name']),
+                                colors = list(self.df['sector']),
+                                left_labels = 'rank',
+                                **self.kwargs)._repr_png_()
+
+    def check(self, bars):
+        b, _ = bars._repr_png_()
+        self.assertEqual(b, self.expected)
+
+    def test_data_frame(self):
+        bars = Bars.from_frame(self.df,
+                               numbers = 'x',
+                               right_labels = 'name',
+                               colors = 'sector',
+                               left_labels = 'rank',
+                               **self.kwargs)
+        self.assertIsInstance(bars.data.numbers, np.ndarray)
+        self.check(bars)
+
+    def test_accessor(self):
+        bars = self.df.catbars.barh(numbers = 'x',
+                                    right_labels = 'name',
+                                    colors = 'sector',
+                                    left_labels = 'rank',
+                                    **self.kwargs)
+        self.check(bars)
+
+    def test_dict_of_arrays(self):
+        data = {name : np.asarray(self.df[name]) for name in self.df}
+        bars = Bars.from_frame(data,
+                               numbers = 'x',
+                               right_labels = 'name',
+                               colors = 'sector',
+                               left_labels = 'rank',
+                               **self.kwargs)
+        self.check(bars)
+
+    def test_structured_array(self):
+        data = np.array(list(zip(self.df['x'],
+                                 self.df['name'],
+                                 self.df['sector'])),
+                        dtype = [('x', 'f8'),
+                                 ('name', 'U1'),
+                                 ('sector', 'U2')])
+        bars = Bars.from_frame(memoryview(data),
+                               numbers = 'x',
+                               right_labels = 'name',
+                               colors = 'sector',
+                               left_labels = 'rank',
+                               **self.kwargs)
+        self.check(bars)
+
+    def test_missing_column(self):
+        with self.assertRaises(KeyError):
+            Bars.from_frame(self.df, numbers = 'y')
+
+
+class TestCodedColumn(unittest.TestCase):
+    def test_values(self):
+        column = CodedColumn([1, 0, -1, 1], ['a', 'b'])
+        self.assertEqual(len(column), 4)
+        self.assertEqual(list(column)[:2], ['b', 'a'])
+        self.assertTrue(np.isnan(column[2]))
+        self.assertEqual(column.take(np.array([3, 1])), ['b', 'a'])
+
+
+class TestMemoryMaps(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        n = 10**6
+        self.numbers = np.random.RandomState(0).rand(n).astype(np.float32)
+        self.codes = (np.arange(n) % 5).astype(np.int8)
+        self.categories = ['a', 'b', 'c', 'd', 'e']
+        self.file_name = os.path.join(self.directory.name, 'day.npz')
+        np.savez(self.file_name, x = self.numbers, codes = self.codes)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_load_npz(self):
+        columns = load_npz(self.file_name)
+        self.assertIsInstance(columns['x'], np.memmap)
+        self.assertTrue(np.array_equal(columns['x'], self.numbers))
+        self.assertTrue(np.array_equal(columns['codes'], self.codes))
+
+    def test_no_copy(self):
+        columns = load_npz(self.file_name)
+        columns['sector'] = CodedColumn(columns['codes'], self.categories)
+        for kwargs in [{'sort' : True, 'slice' : (1, 30)},
+                       {'sort' : True, 'slice' : (5, 30)},
+                       {'slice' : (1, 30)}]:
+            with self.subTest(**kwargs):
+                tracemalloc.start()
+                try:
+                    bars = Bars.from_frame(columns,
+                                           numbers = 'x',
+                                           colors = 'sector',
+                                           right_labels = 'proportion',
+                                           global_view = True,
+                                           lazy = True,
+                                           **kwargs)
+                    _, peak = tracemalloc.get_traced_memory()
+                finally:
+                    tracemalloc.stop()
+                self.assertLess(peak, self.numbers.nbytes / 4)
+                expected = np.sort(self.numbers)[::-1]
+                if 'sort' in kwargs:
+                    start, end = kwargs['slice']
+                    self.assertEqual(bars.data.numbers.tolist(),
+                                     expected[start-1:end][::-1].tolist())
+                self.assertEqual(bars.data.maximum, expected[0])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,94 @@
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+import multiprocessing
+import os
+import threading
+
+import matplotlib
+from matplotlib import rcParams
+import catbars
+from catbars import Bars
+from catbars import bars as bars_module
+from catbars.conf import Conf
+
+
+
+def render_in_child():
+    # Every process-wide lock is used.
+    catbars.layout_cache.resize(8)
+    catbars.text_extent_cache.resize(64)
+    Bars([4, 1, 3, 2], instrumented = True).to_bytes('png')
+
+
+
+class TestConf(unittest.TestCase):
+    def setUp(self):
+        self.specs = [{'numbers' : [4, 1, 3, 2 + i],
+                       'left_labels' : ['d', 'a', 'c', 'b'],
+                       'right_labels' : 'proportion',
+                       'colors' : ['DD', 'AA', 'CC', 'BB'],
+                       'title' : r'$\mathtt{Chart}$ ' + str(i),
+                       'xlabel' : 'x',
+                       'data_font_size' : 6 + i % 5}
+                      for i in range(16)]
+
+    def render(self, spec):
+        b, _ = Bars(**spec)._repr_png_()
+        return b
+
+    def test_rcparams_untouched(self):
+        with self.subTest(param = 'font.size'):
+            size = rcParams['font.size']
+            Bars([4, 1, 3, 2], data_font_size = size + 3)
+            self.assertEqual(rcParams['font.size'], size)
+
+    def test_threads(self):
+        expected = [self.render(spec) for spec in self.specs]
+        with ThreadPoolExecutor(max_workers = 8) as executor:
+            results = list(executor.map(self.render, self.specs))
+        for i, b in enumerate(results):
+            with self.subTest(chart = i):
+                self.assertEqual(b, expected[i])
+
+    def test_run_conf_deprecated(self):
+        with matplotlib.rc_context():
+            with self.assertWarns(DeprecationWarning):
+                Conf.run_conf({'data_font_size' : 7})
+            self.assertEqual(rcParams['font.size'], 7)
+
+    @unittest.skipUnless(hasattr(os, 'fork'), 'fork() is not available')
+    def test_fork_while_locked(self):
+        # Another thread holds a lock when the process forks.
+        locks = {'figure' : lambda: bars_module._mpl_lock,
+                 'layout_cache' : lambda: catbars.layout_cache._lock,
+                 'text_extent_cache' :
+                     lambda: catbars.text_extent_cache._lock,
+                 'hooks' : lambda: catbars.hooks._lock}
+        for name, get_lock in locks.items():
+            with self.subTest(lock = name):
+                self.fork_while_locked(get_lock())
+
+    def fork_while_locked(self, lock):
+        locked = threading.Event()
+        release = threading.Event()
+        def hold():
+            with lock:
+                locked.set()
+                release.wait()
+        thread = threading.Thread(target = hold)
+        thread.start()
+        try:
+            locked.wait()
+            context = multiprocessing.get_context('fork')
+            child = context.Process(target = render_in_child)
+            child.start()
+            child.join(30)
+            if child.is_alive():
+                child.kill()
+            self.assertEqual(child.exitcode, 0)
+        finally:
+            release.set()
+            thread.join()
+
+if __name__ == '__main__':
+    unittest.main()
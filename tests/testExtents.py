@@ -0,0 +1,62 @@
+import unittest
+
+import catbars
+from catbars import Bars
+from catbars.extents import ExtentCache
+
+
+
+class TestExtentCache(unittest.TestCase):
+    def setUp(self):
+        self.args = [[4, 1, 3, 2]]
+        self.kwargs = {
+            'left_labels' : ['d', 'a', 'c', 'b'],
+            'right_labels' : 'proportion',
+            'colors' : ['DD', 'AA', 'CC', 'BB'],
+            'title' : 'Title',
+            'xlabel' : 'x',
+            'ylabel' : 'y'}
+        catbars.text_extent_cache.clear()
+
+    def tearDown(self):
+        catbars.text_extent_cache.resize(0)
+        catbars.text_extent_cache.clear()
+
+    def test_same_figure(self):
+        b, _ = Bars(*self.args, **self.kwargs)._repr_png_()
+        catbars.text_extent_cache.resize(1000)
+        first, _ = Bars(*self.args, **self.kwargs)._repr_png_()
+        second, _ = Bars(*self.args, **self.kwargs)._repr_png_()
+        self.assertEqual(b, first)
+        self.assertEqual(b, second)
+
+    def test_counters(self):
+        catbars.text_extent_cache.resize(1000)
+        Bars(*self.args, **self.kwargs)
+        misses = catbars.text_extent_cache.misses
+        self.assertGreater(misses, 0)
+        Bars(*self.args, **self.kwargs)
+        self.assertEqual(catbars.text_extent_cache.misses, misses)
+        self.assertGreater(catbars.text_extent_cache.hits, 0)
+        catbars.text_extent_cache.clear()
+        self.assertEqual(catbars.text_extent_cache.stats()['size'], 0)
+        self.assertEqual(catbars.text_extent_cache.hits, 0)
+
+    def test_lru_eviction(self):
+        cache = ExtentCache(maxsize = 2)
+        cache.get('a', lambda: (1, 1))
+        cache.get('b', lambda: (2, 2))
+        cache.get('a', lambda: (0, 0)) # 'a' is the most recent key.
+        cache.get('c', lambda: (3, 3))
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.get('a', lambda: (0, 0)), (1, 1))
+        self.assertEqual(cache.get('b', lambda: (0, 0)), (0, 0))
+
+    def test_disabled(self):
+        cache = ExtentCache()
+        cache.get('a', lambda: (1, 1))
+        self.assertEqual(len(cache), 0)
+        self.assertEqual(cache.misses, 0)
+
+if __name__ == '__main__':
+    unittest.main()
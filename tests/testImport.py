@@ -0,0 +1,80 @@
+import unittest
+import os
+import subprocess
+import sys
+
+import catbars
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(catbars.__file__)))
+
+
+def run(code, *options):
+    env = dict(os.environ, PYTHONPATH = ROOT)
+    return subprocess.run([sys.executable, *options, '-c', code],
+                          capture_output = True,
+                          text = True,
+                          env = env,
+                          check = True)
+
+
+class TestImport(unittest.TestCase):
+    def test_light_import(self):
+        # The import time is measured by benchmarks/suite.py.
+        code = """
+import sys
+import catbars
+for name in ['matplotlib', 'numpy', 'pandas', 'catbars.bars']:
+    print(name in sys.modules)
+"""
+        self.assertEqual(run(code).stdout.split(), ['False'] * 4)
+
+    def test_lazy_matplotlib(self):
+        code = """
+import sys
+from catbars import Bars
+before = 'matplotlib.figure' in sys.modules
+Bars([4, 1, 3])
+print(before, 'matplotlib.figure' in sys.modules)
+"""
+        self.assertEqual(run(code).stdout.split(), ['False', 'True'])
+
+    def test_accessor(self):
+        code = """
+import pandas as pd
+import catbars
+print(hasattr(pd.DataFrame, 'catbars'))
+"""
+        self.assertEqual(run(code).stdout.split(), ['True'])
+
+    def test_accessor_after_catbars(self):
+        code = """
+import sys
+import catbars
+print('pandas' in sys.modules)
+import pandas as pd
+print(hasattr(pd.DataFrame, 'catbars'))
+# Registered on first access to Bars.
+catbars.Bars
+print(hasattr(pd.DataFrame, 'catbars'))
+df = pd.DataFrame({'cap' : [4, 1, 3]})
+print(df.catbars.barh(numbers = 'cap', lazy = True).data.length)
+"""
+        self.assertEqual(run(code).stdout.split(),
+                         ['False', 'False', 'True', '3'])
+
+    def test_explicit_accessor_import(self):
+        code = """
+import sys
+import catbars
+import pandas as pd
+import catbars.accessors
+print(hasattr(pd.DataFrame, 'catbars'))
+# catbars doesn't install import hooks.
+print(any(type(finder).__module__.startswith('catbars')
+          for finder in sys.meta_path))
+"""
+        self.assertEqual(run(code).stdout.split(), ['True', 'False'])
+
+if __name__ == '__main__':
+    unittest.main()
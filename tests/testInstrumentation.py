@@ -0,0 +1,69 @@
+import unittest
+
+import catbars
+from catbars import Bars
+
+
+
+class TestInstrumentation(unittest.TestCase):
+    def setUp(self):
+        self.kwargs = {
+            'left_labels' : ['d', 'a', 'c', 'b'],
+            'right_labels' : 'proportion',
+            'colors' : ['DD', 'AA', 'CC', 'BB'],
+            'title' : 'Title',
+            'xlabel' : 'x',
+            'ylabel' : 'y'}
+        self.events = []
+
+    def tearDown(self):
+        catbars.hooks.clear()
+
+    def hook(self, bars, event):
+        self.events.append(event)
+
+    def test_timings(self):
+        bars = Bars([4, 1, 3, 2], instrumented = True, **self.kwargs)
+        for phase in ['model', 'figure', 'title', 'left_labels', 'ylabel',
+                      'legend', 'right_labels', 'right_label_layout',
+                      'x_ticklabels', 'xlabel', 'draw']:
+            self.assertGreater(bars.timings[phase], 0)
+        self.assertEqual(bars.counts['draws'], 1)
+        self.assertGreater(bars.counts['text_measurements'], 0)
+        bars.update([1, 2, 3, 4])
+        self.assertEqual(bars.counts['draws'], 2)
+        self.assertIn('update', bars.timings)
+
+    def test_not_instrumented(self):
+        bars = Bars([4, 1, 3, 2], **self.kwargs)
+        self.assertEqual(bars.timings, {})
+        self.assertEqual(bars.counts, {'draws' : 0,
+                                       'text_measurements' : 0})
+
+    def test_hooks(self):
+        catbars.hooks.add(self.hook)
+        bars = Bars([4, 1, 3, 2], lazy = True, **self.kwargs)
+        bars.to_bytes('png')
+        self.assertEqual(self.events, ['model', 'figure', 'encode'])
+        self.assertIn('encode', bars.timings)
+        catbars.hooks.remove(self.hook)
+        Bars([4, 1, 3, 2])
+        self.assertEqual(len(self.events), 3)
+
+    def test_failing_hook(self):
+        def hook(bars, event):
+            raise RuntimeError
+        catbars.hooks.add(hook)
+        catbars.hooks.add(self.hook)
+        with self.assertLogs('catbars.instrumentation', 'ERROR'):
+            Bars([4, 1, 3, 2])
+        self.assertEqual(self.events, ['model', 'figure'])
+
+    def test_logging(self):
+        with self.assertLogs('catbars.bars', 'INFO') as logs:
+            Bars([4, 1, 3, 2], **self.kwargs)
+        self.assertTrue(any('Position of the Axes' in line
+                            for line in logs.output))
+
+if __name__ == '__main__':
+    unittest.main()
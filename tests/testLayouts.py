@@ -0,0 +1,67 @@
+import unittest
+
+import catbars
+from catbars import Bars
+from catbars.caches import LRUCache
+from catbars.extents import ExtentCache
+from catbars.layouts import LayoutCache
+
+
+
+class TestLayoutTemplates(unittest.TestCase):
+    def setUp(self):
+        self.kwargs = {
+            'left_labels' : ['d', 'a', 'c', 'b'],
+            'right_labels' : 'proportion',
+            'colors' : ['DD', 'AA', 'CC', 'BB'],
+            'line_dic' : {'number' : 2.5,
+                          'color' : 'red',
+                          'label' : 'line'},
+            'title' : 'Title',
+            'xlabel' : 'x',
+            'ylabel' : 'y',
+            'legend_title' : 'Legend'}
+        catbars.layout_cache.clear()
+
+    def tearDown(self):
+        catbars.layout_cache.resize(0)
+        catbars.layout_cache.clear()
+
+    def test_template(self):
+        template = Bars([4, 1, 3, 2],
+                        **self.kwargs).get_layout_template()
+        # New numbers, same labels.
+        numbers = [40, 12, 33, 2]
+        expected, _ = Bars(numbers, **self.kwargs)._repr_png_()
+        b, _ = Bars(numbers,
+                    layout_template = template,
+                    **self.kwargs)._repr_png_()
+        self.assertEqual(b, expected)
+
+    def test_cache(self):
+        expected, _ = Bars([4, 1, 3, 2], **self.kwargs)._repr_png_()
+        catbars.layout_cache.resize(10)
+        Bars([4, 1, 3, 2], **self.kwargs)
+        self.assertEqual(catbars.layout_cache.misses, 1)
+        b, _ = Bars([4, 1, 3, 2], **self.kwargs)._repr_png_()
+        self.assertEqual(catbars.layout_cache.hits, 1)
+        self.assertEqual(b, expected)
+        # The legend is part of the key.
+        Bars([4, 1, 3, 2], **self.kwargs, legend_visible = False)
+        self.assertEqual(catbars.layout_cache.misses, 2)
+
+    def test_invalid_template(self):
+        with self.assertRaises(TypeError):
+            Bars([4, 1, 3, 2], layout_template = {'x0' : 0})
+
+    def test_cache_class(self):
+        self.assertIsInstance(catbars.layout_cache, LRUCache)
+        self.assertNotIsInstance(catbars.layout_cache, ExtentCache)
+        cache = LayoutCache(maxsize = 1)
+        cache.store('a', {'x0' : 0})
+        cache.store('b', {'x0' : 1})
+        self.assertIsNone(cache.lookup('a'))
+        self.assertEqual(cache.lookup('b'), {'x0' : 1})
+
+if __name__ == '__main__':
+    unittest.main()
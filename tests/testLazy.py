@@ -0,0 +1,40 @@
+import unittest
+
+from catbars import Bars
+
+
+
+class TestLazy(unittest.TestCase):
+    def setUp(self):
+        self.args = [[4, 1, 3, 2]]
+        self.kwargs = {
+            'left_labels' : ['d', 'a', 'c', 'b'],
+            'right_labels' : 'proportion',
+            'colors' : ['DD', 'AA', 'CC', 'BB'],
+            'line_dic' : {'number' : 2.5,
+                          'color' : 'red',
+                          'label' : 'line'},
+            'title' : 'Title'}
+
+    def test_no_figure(self):
+        bars = Bars(*self.args, **self.kwargs, lazy = True)
+        self.assertIsNotNone(bars.data)
+        self.assertIsNone(bars._fig)
+
+    def test_same_figure(self):
+        expected, _ = Bars(*self.args, **self.kwargs)._repr_png_()
+        bars = Bars(*self.args, **self.kwargs, lazy = True)
+        b, _ = bars._repr_png_()
+        self.assertEqual(b, expected)
+        fig = bars.fig
+        bars._repr_png_()
+        self.assertIs(bars.fig, fig)
+
+    def test_validation(self):
+        with self.assertRaises(ValueError):
+            Bars([-1, 2], lazy = True)
+        with self.assertRaises(TypeError):
+            Bars(*self.args, line_dic = {'number' : 1}, lazy = True)
+
+if __name__ == '__main__':
+    unittest.main()
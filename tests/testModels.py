@@ -1,6 +1,10 @@
 import unittest
+import tracemalloc
 import numpy as np
+import pandas as pd
 from catbars import Bars
+from catbars.models import ModelFactory, min_max_sum, factorize
+from catbars.columns import CodedColumn
 
 
 
@@ -20,6 +24,8 @@ class TestModels(unittest.TestCase):
         for i, att_name in enumerate(self.features):
             with self.subTest(feature = att_name):
                 att = getattr(bars.data, att_name)
+                if isinstance(att, np.ndarray):
+                    att = att.tolist()
                 self.assertEqual(att, expected_values[i])
 
     def test_sort_option(self):
@@ -53,5 +59,200 @@ class TestModels(unittest.TestCase):
                            ['AA', 'BB', 'CC']]
         self.check_features(bars, expected_values)
 
+
+class TestNumbers(unittest.TestCase):
+    def test_containers(self):
+        expected = Bars([4, 1, 3, 2]).data.numbers
+        for numbers in [np.array([4, 1, 3, 2]),
+                        np.array([4, 1, 3, 2], dtype = np.float32),
+                        pd.Series([4., 1., 3., 2.], index = list('abcd')),
+                        (4, 1, 3, 2)]:
+            with self.subTest(numbers = type(numbers)):
+                data = Bars(numbers, lazy = True).data
+                self.assertEqual(data.numbers.dtype, np.float64)
+                self.assertTrue(data.numbers.flags['C_CONTIGUOUS'])
+                self.assertEqual(data.numbers.tolist(), expected.tolist())
+                self.assertEqual((data.minimum, data.maximum), (1, 4))
+
+    def test_input_unchanged(self):
+        numbers = np.array([4., 1., 3., 2.])
+        Bars(numbers, sort = True, slice = (1, 3), lazy = True)
+        self.assertEqual(numbers.tolist(), [4, 1, 3, 2])
+
+    def test_invalid_numbers(self):
+        for numbers in [[4, -1, 3], [4, np.nan, 3], [], [[4, 1]], ['a']]:
+            with self.subTest(numbers = numbers):
+                with self.assertRaises(ValueError):
+                    Bars(numbers, lazy = True)
+
+    def test_nan_rejected(self):
+        # NaN numbers used to be accepted (undrawn bars).
+        for numbers in [[4, 1, np.nan, 3],
+                        np.array([4, 1, np.nan, 3]),
+                        np.array([4, 1, np.nan, 3], dtype = np.float32)]:
+            with self.subTest(numbers = numbers):
+                with self.assertRaisesRegex(ValueError,
+                                            'NaN.*position 2'):
+                    Bars(numbers, sort = True, lazy = True)
+        rows = iter([(4,), (1,), (np.nan,), (3,)])
+        with self.assertRaisesRegex(ValueError, 'NaN.*position 2'):
+            Bars.from_iterable(rows,
+                               sort = True,
+                               slice = (1, 2),
+                               global_view = True,
+                               lazy = True)
+
+    def test_min_max_sum(self):
+        numbers = np.random.RandomState(0).rand(1000)
+        self.assertEqual(min_max_sum(numbers, chunk_size = 64)[:2],
+                         (numbers.min(), numbers.max()))
+        self.assertAlmostEqual(min_max_sum(numbers, chunk_size = 64)[2],
+                               numbers.sum())
+
+
+class TestTopRows(unittest.TestCase):
+    """
+    With a slice starting at 1, only the displayed rows are sorted.
+    """
+    def test_same_rows(self):
+        rng = np.random.RandomState(0)
+        n = 1000
+        kwargs = {
+            'left_labels' : rng.choice(list('abc'), n),
+            'right_labels' : 'rank',
+            # Equal counts.
+            'colors' : ['c{}'.format(i % 4) for i in range(n)],
+            'tints' : ['red', 'blue', 'green'],
+            'sort' : True,
+            'global_view' : True}
+        numbers = rng.randint(0, 20, n)
+        expected = ModelFactory(numbers, **kwargs).model
+        for k in [1, 30, 100]:
+            with self.subTest(k = k):
+                data = ModelFactory(numbers,
+                                    slice = (1, k),
+                                    **kwargs).model
+                for name in ['numbers',
+                             'left_labels',
+                             'right_labels',
+                             'actual_colors']:
+                    self.assertEqual(list(getattr(data, name)),
+                                     list(getattr(expected, name))[-k:])
+                self.assertEqual(data.legend_labels, expected.legend_labels)
+                self.assertEqual(data.legend_colors, expected.legend_colors)
+                self.assertEqual((data.minimum, data.maximum),
+                                 (expected.minimum, expected.maximum))
+
+
+class TestColorCodes(unittest.TestCase):
+    """
+    Coded and factorized colors give the same output as lists.
+    """
+    def setUp(self):
+        rng = np.random.RandomState(0)
+        self.numbers = rng.randint(1, 10, 200)
+        # Equal counts for 'b' and 'c'.
+        self.colors = list(rng.permutation(['a'] * 80 +
+                                           ['b'] * 40 +
+                                           ['c'] * 40 +
+                                           ['d'] * 30 +
+                                           ['e'] * 10))
+        self.kwargs = {'tints' : ['red', 'blue', 'green'],
+                       'global_view' : True}
+
+    def check(self, colors, **kwargs):
+        expected = ModelFactory(self.numbers,
+                                colors = self.colors,
+                                **self.kwargs,
+                                **kwargs).model
+        data = ModelFactory(self.numbers,
+                            colors = colors,
+                            **self.kwargs,
+                            **kwargs).model
+        for name in ['actual_colors', 'legend_labels', 'legend_colors']:
+            self.assertEqual(getattr(data, name), getattr(expected, name))
+
+    def test_containers(self):
+        categories = sorted(set(self.colors))
+        containers = {
+            'array' : np.array(self.colors),
+            'series' : pd.Series(self.colors),
+            'categorical' : pd.Series(self.colors, dtype = 'category'),
+            'coded' : CodedColumn([categories.index(c)
+                                   for c in self.colors],
+                                  categories)}
+        for name, colors in containers.items():
+            self.assertIsNotNone(factorize(colors))
+            for kwargs in [{},
+                           {'slice' : (1, 30)},
+                           {'sort' : True, 'slice' : (1, 30)},
+                           {'color_dic' : {'a' : 'red'}}]:
+                with self.subTest(container = name, **kwargs):
+                    self.check(colors, **kwargs)
+
+    def test_missing_values(self):
+        codes, categories = factorize(CodedColumn([0, -1, 1], ['a', 'b']))
+        self.assertEqual(len(categories), 3)
+        self.assertTrue(np.isnan(categories[-1]))
+
+
+class TestMemory(unittest.TestCase):
+    """
+    Only the displayed rows are copied.
+    """
+    def setUp(self):
+        self.n = 10**5
+        self.numbers = np.random.RandomState(0).rand(self.n)
+        self.kwargs = {
+            'left_labels' : ['l{}'.format(i % 100) for i in range(self.n)],
+            'right_labels' : 'proportion',
+            'colors' : ['c{}'.format(i % 5) for i in range(self.n)],
+            'tints' : ['red', 'blue'],
+            'global_view' : True,
+            'slice' : (1, 30)}
+
+    def get_peak(self, **kwargs):
+        tracemalloc.start()
+        try:
+            data = ModelFactory(self.numbers,
+                                **self.kwargs,
+                                **kwargs).model
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        self.assertEqual(data.length, 30)
+        return peak
+
+    def test_global_view(self):
+        # Less than a copy of "numbers".
+        self.assertLess(self.get_peak(), self.numbers.nbytes / 10)
+
+    def test_sorted_global_view(self):
+        # Sorting only requires integer indices.
+        self.assertLess(self.get_peak(sort = True),
+                        3 * self.numbers.nbytes)
+
+    def test_displayed_rows_only(self):
+        # Labels and colors are only taken for the displayed rows.
+        class Recorder(list):
+            taken = 0
+            def take(self, indices):
+                Recorder.taken += len(indices)
+                return [self[i] for i in indices.tolist()]
+
+        kwargs = dict(self.kwargs,
+                      left_labels = 'rank',
+                      colors = Recorder(self.kwargs['colors']))
+        for sort in [False, True]:
+            with self.subTest(sort = sort):
+                Recorder.taken = 0
+                data = ModelFactory(self.numbers,
+                                    sort = sort,
+                                    **kwargs).model
+                self.assertLess(Recorder.taken, 100)
+                self.assertEqual(len(data.left_labels), 30)
+                self.assertEqual(len(data.right_labels), 30)
+                self.assertEqual(len(data.actual_colors), 30)
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,41 @@
+import unittest
+from io import BytesIO
+
+from catbars import Bars
+
+
+
+class TestEncodedOutputs(unittest.TestCase):
+    def setUp(self):
+        self.bars = Bars([4, 1, 3, 2],
+                         right_labels = 'proportion',
+                         colors = ['DD', 'AA', 'CC', 'BB'],
+                         title = 'Title')
+
+    def test_cached(self):
+        b = self.bars.to_bytes('png')
+        self.assertIs(self.bars.to_bytes('png'), b)
+        self.assertIs(self.bars._repr_png_()[0], b)
+        pdf = self.bars.to_bytes('pdf')
+        self.assertTrue(pdf.startswith(b'%PDF'))
+        self.assertIs(self.bars.to_bytes('png'), b)
+        buf = BytesIO()
+        self.bars.print_png(buf)
+        self.assertEqual(buf.getvalue(), b)
+
+    def test_invalidation(self):
+        b = self.bars.to_bytes('png')
+        self.bars.ax.title.set_visible(False)
+        new_b = self.bars.to_bytes('png')
+        self.assertNotEqual(new_b, b)
+        # The figure is drawn by another method.
+        self.bars.ax.title.set_visible(True)
+        self.bars.canvas.draw()
+        self.assertEqual(self.bars.to_bytes('png'), b)
+
+    def test_format(self):
+        with self.assertRaises(ValueError):
+            self.bars.to_bytes('svg')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+import unittest
+import numpy as np
+from matplotlib.collections import PolyCollection
+
+from catbars import Bars
+from catbars.models import ModelFactory, get_default_anchors
+
+
+
+class TestOverviewModel(unittest.TestCase):
+    def setUp(self):
+        # Sorted: 9 8 7 6 5 4 3 2 1.
+        self.numbers = [3, 9, 1, 8, 5, 2, 7, 4, 6]
+        self.colors = ['b', 'a', 'b', 'a', 'b', 'b', 'c', 'c', 'c']
+
+    def get_model(self, **kwargs):
+        return ModelFactory(self.numbers,
+                            colors = self.colors,
+                            sort = True,
+                            global_view = False,
+                            bins = 3,
+                            **kwargs).model
+
+    def test_aggregates(self):
+        for aggregate, expected in [('max', [9, 6, 3]),
+                                    ('mean', [8, 5, 2]),
+                                    ('sum', [24, 15, 6])]:
+            with self.subTest(aggregate = aggregate):
+                data = self.get_model(overview = aggregate)
+                # Reversed for Matplotlib.
+                self.assertEqual(data.numbers.tolist(), expected[::-1])
+                self.assertEqual(data.length, 3)
+
+    def test_colors(self):
+        data = self.get_model(overview = 'max')
+        # 9 8 7: a a c, 6 5 4: c b c, 3 2 1: b b b.
+        self.assertEqual(data.colors, ['b', 'c', 'a'])
+        self.assertEqual(len(data.actual_colors), 3)
+
+    def test_anchors(self):
+        data = self.get_model(overview = 'max',
+                              anchors = [1, 2, 5],
+                              left_labels = list('ihgfedcba'))
+        # Rows 1 and 2 are in the same bar.
+        self.assertEqual(data.anchors, [(2, 'h'), (1, 'e')])
+        data = self.get_model(overview = 'max',
+                              anchors = [1, 2, 5],
+                              left_labels = 'rank')
+        self.assertEqual(data.anchors, [(2, '1'), (1, '5')])
+        self.assertEqual(get_default_anchors(95),
+                         [1, 10, 20, 30, 40, 50, 60, 70, 80, 90])
+
+    def test_invalid_arguments(self):
+        for kwargs in [{'overview' : 'median'},
+                       {'overview' : 'max', 'slice' : (1, 3)},
+                       {'overview' : 'max', 'right_labels' : 'rank'},
+                       {'overview' : 'max', 'right_labels' : 'proportion'},
+                       {'overview' : 'max', 'left_labels' : 'proportion'},
+                       {'overview' : 'max', 'anchors' : [0]}]:
+            with self.subTest(**kwargs):
+                with self.assertRaises(ValueError):
+                    self.get_model(**kwargs)
+        with self.assertRaises(ValueError):
+            ModelFactory(self.numbers,
+                         global_view = False,
+                         overview = 'max').model
+
+
+class TestOverview(unittest.TestCase):
+    def test_bars(self):
+        n = 10**5
+        numbers = np.random.RandomState(0).rand(n)
+        colors = np.array(['c{}'.format(i % 3) for i in range(n)])
+        bars = Bars(numbers,
+                    colors = colors,
+                    sort = True,
+                    overview = True,
+                    title = 'Title')
+        _, height = bars.conf['figsize']
+        self.assertLessEqual(bars.data.length, height * bars.conf['dpi'])
+        self.assertIsInstance(bars.bars, PolyCollection)
+        labels = [t.get_text() for t in bars.ax.get_yticklabels()]
+        self.assertEqual(sorted(labels, key = int),
+                         ['1'] + [str(10**4 * i) for i in range(1, 11)])
+        self.assertEqual(bars.data.maximum, numbers.max())
+        self.assertIsNotNone(bars.to_bytes('png'))
+
+if __name__ == '__main__':
+    unittest.main()
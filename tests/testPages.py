@@ -0,0 +1,109 @@
+import unittest
+from unittest import mock
+import random
+
+from catbars import Bars
+from catbars import bars as bars_module
+from catbars.models import GlobalViewModel
+
+
+
+class TestPages(unittest.TestCase):
+    def setUp(self):
+        rng = random.Random(0)
+        n = 95
+        self.numbers = [rng.randint(1, 50) for _ in range(n)]
+        self.kwargs = {
+            'left_labels' : 'rank',
+            'right_labels' : 'proportion',
+            'colors' : [rng.choice(['AA', 'BB', 'CC', 'DD'])
+                        for _ in range(n)],
+            'title' : 'Title'}
+
+    def test_pages(self):
+        starts = []
+        for bars in Bars.paginate(self.numbers,
+                                  page_size = 30,
+                                  reuse = True,
+                                  **self.kwargs):
+            start, end = bars._model_kwargs['slice']
+            starts.append(start)
+            expected, _ = Bars(self.numbers,
+                               sort = True,
+                               slice = (start, end),
+                               global_view = True,
+                               **self.kwargs)._repr_png_()
+            b, _ = bars._repr_png_()
+            self.assertEqual(b, expected)
+        self.assertEqual(starts, [1, 31, 61, 91])
+        self.assertEqual(bars.data.length, 5)
+
+    def test_lazy(self):
+        pages = list(Bars.paginate(self.numbers,
+                                   page_size = 50,
+                                   lazy = True,
+                                   **self.kwargs))
+        self.assertEqual(len(pages), 2)
+        expected, _ = Bars(self.numbers,
+                           sort = True,
+                           slice = (51, 95),
+                           global_view = True,
+                           **self.kwargs)._repr_png_()
+        self.assertEqual(pages[-1]._repr_png_()[0], expected)
+        # Each page is an independent chart.
+        self.assertIsNot(pages[0], pages[1])
+        expected, _ = Bars(self.numbers,
+                           sort = True,
+                           slice = (1, 50),
+                           global_view = True,
+                           **self.kwargs)._repr_png_()
+        self.assertEqual(pages[0]._repr_png_()[0], expected)
+
+    def test_distinct_pages(self):
+        pages = list(Bars.paginate(self.numbers,
+                                   page_size = 30,
+                                   **self.kwargs))
+        self.assertEqual(len(set(map(id, pages))), 4)
+        for bars in pages:
+            start, end = bars._model_kwargs['slice']
+            with self.subTest(start = start):
+                expected, _ = Bars(self.numbers,
+                                   sort = True,
+                                   slice = (start, end),
+                                   global_view = True,
+                                   **self.kwargs)._repr_png_()
+                self.assertEqual(bars._repr_png_()[0], expected)
+
+    def test_reuse(self):
+        pages = list(Bars.paginate(self.numbers,
+                                   page_size = 30,
+                                   reuse = True,
+                                   **self.kwargs))
+        self.assertEqual(len(set(map(id, pages))), 1)
+
+    def test_model_built_once(self):
+        with mock.patch.object(bars_module,
+                               'GlobalViewModel',
+                               wraps = GlobalViewModel) as model, \
+             mock.patch.object(bars_module,
+                               'ModelFactory') as factory:
+            pages = Bars.paginate(self.numbers,
+                                  page_size = 30,
+                                  **self.kwargs)
+            self.assertEqual(len([bars.data.length for bars in pages]), 4)
+        self.assertEqual(model.call_count, 1)
+        factory.assert_not_called()
+
+    def test_numbers_only_sequences(self):
+        page = next(Bars.paginate(self.numbers, lazy = True)).data
+        with self.assertRaises(TypeError):
+            Bars(page, lazy = True)
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(TypeError):
+            next(Bars.paginate(self.numbers, slice = (1, 10)))
+        with self.assertRaises(ValueError):
+            next(Bars.paginate(self.numbers, page_size = 0))
+
+if __name__ == '__main__':
+    unittest.main()
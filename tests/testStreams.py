@@ -0,0 +1,87 @@
+import unittest
+import csv
+import os
+import random
+import tempfile
+import tracemalloc
+
+from catbars import Bars
+
+
+
+class TestStreams(unittest.TestCase):
+    def setUp(self):
+        rng = random.Random(0)
+        self.rows = [(rng.randint(1, 20),
+                      rng.choice('abc'),
+                      'c{}'.format(rng.randint(0, 3)))
+                     for _ in range(500)]
+        self.kwargs = {'sort' : True,
+                       'slice' : (1, 30),
+                       'global_view' : True,
+                       'left_labels' : 'rank',
+                       'title' : 'Title'}
+
+    def check(self, bars):
+        expected, _ = Bars([row[0] for row in self.rows],
+                           right_labels = [row[1] for row in self.rows],
+                           colors = [row[2] for row in self.rows],
+                           **self.kwargs)._repr_png_()
+        b, _ = bars._repr_png_()
+        self.assertEqual(b, expected)
+
+    def test_iterable(self):
+        bars = Bars.from_iterable(iter(self.rows),
+                                  numbers = 0,
+                                  right_labels = 1,
+                                  colors = 2,
+                                  chunk_size = 64,
+                                  **self.kwargs)
+        self.check(bars)
+
+    def test_csv(self):
+        with tempfile.TemporaryDirectory() as directory:
+            file_name = os.path.join(directory, 'rows.csv')
+            with open(file_name, 'w', newline = '') as f:
+                writer = csv.writer(f)
+                writer.writerow(['x', 'name', 'sector'])
+                writer.writerows(self.rows)
+            bars = Bars.from_csv(file_name,
+                                 numbers = 'x',
+                                 right_labels = 'name',
+                                 colors = 'sector',
+                                 **self.kwargs)
+        self.check(bars)
+
+    def test_invalid_number(self):
+        rows = [(4, 'a'), (-1, 'b'), (3, 'c')]
+        with self.assertRaises(ValueError):
+            Bars.from_iterable(rows, right_labels = 1, lazy = True)
+
+    def test_bounded_memory(self):
+        # 200 000 rows of 16 KB: 3 GB if they were kept.
+        label = 'x' * 2**14
+        def rows():
+            rng = random.Random(0)
+            for i in range(2 * 10**5):
+                yield (rng.random(), label, 'c{}'.format(i % 7))
+
+        tracemalloc.start()
+        try:
+            bars = Bars.from_iterable(rows(),
+                                      right_labels = 1,
+                                      colors = 2,
+                                      chunk_size = 1024,
+                                      sort = True,
+                                      slice = (1, 30),
+                                      global_view = True,
+                                      lazy = True)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        self.assertLess(peak, 2**21)
+        self.assertEqual(bars.data.length, 30)
+        self.assertEqual(len(bars.data.legend_labels), 7)
+
+if __name__ == '__main__':
+    unittest.main()
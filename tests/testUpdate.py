@@ -0,0 +1,64 @@
+import unittest
+
+from catbars import Bars
+
+
+
+class TestUpdate(unittest.TestCase):
+    def setUp(self):
+        self.kwargs = {
+            'left_labels' : ['d', 'a', 'c', 'b'],
+            'colors' : ['DD', 'AA', 'CC', 'BB'],
+            'line_dic' : {'number' : 2.5,
+                          'color' : 'red',
+                          'label' : 'line'},
+            'title' : 'Title',
+            'xlabel' : 'x',
+            'ylabel' : 'y',
+            'legend_title' : 'Legend'}
+
+    def check(self, bars, numbers, **kwargs):
+        expected, _ = Bars(numbers, **{**self.kwargs, **kwargs})._repr_png_()
+        b, _ = bars._repr_png_()
+        self.assertEqual(b, expected)
+
+    def test_numbers(self):
+        b = Bars([4, 1, 3, 2], right_labels = 'proportion', **self.kwargs)
+        b._repr_png_()
+        b.update([40, 12, 33, 2])
+        self.check(b, [40, 12, 33, 2], right_labels = 'proportion')
+        # The vertical line becomes invisible.
+        b.update([0.4, 0.12, 0.33, 0.2])
+        self.check(b, [0.4, 0.12, 0.33, 0.2], right_labels = 'proportion')
+
+    def test_labels_and_colors(self):
+        b = Bars([4, 1, 3, 2], **self.kwargs)
+        right_labels = ['w', 'x', 'y', 'z']
+        colors = ['AA', 'AA', 'BB', 'EE']
+        b.update([5, 1, 3, 2],
+                 right_labels = right_labels,
+                 colors = colors)
+        self.check(b,
+                   [5, 1, 3, 2],
+                   right_labels = right_labels,
+                   colors = colors)
+
+    def test_scale(self):
+        kwargs = {'auto_scale' : True}
+        b = Bars([1, 10, 1000, 10000], **kwargs)
+        b.update([1, 2, 3, 4])
+        expected, _ = Bars([1, 2, 3, 4], **kwargs)._repr_png_()
+        self.assertEqual(b._repr_png_()[0], expected)
+
+    def test_lazy(self):
+        b = Bars([4, 1, 3, 2], lazy = True, **self.kwargs)
+        b.update([40, 12, 33, 2])
+        self.check(b, [40, 12, 33, 2])
+
+    def test_length(self):
+        b = Bars([4, 1, 3, 2])
+        with self.assertRaises(ValueError):
+            b.update([4, 1, 3])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,57 @@
+import unittest
+import os
+import subprocess
+import sys
+
+import catbars
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(catbars.__file__)))
+
+
+# Prints the cache misses of Matplotlib after the warm-up and after
+# the first chart of the process. Latency is measured by benchmarks/.
+CODE = """
+import sys
+import catbars
+catbars.warmup({'data_font_size' : 9})
+from matplotlib import font_manager, mathtext
+caches = [font_manager._get_font,
+          font_manager.FontManager._findfont_cached,
+          mathtext.MathTextParser._parse_cached]
+print(*[cache.cache_info().misses for cache in caches])
+catbars.Bars([5e6, 2e6, 3e5],
+             left_labels = ['Alpha', 'Beta', 'Gamma'],
+             right_labels = 'proportion',
+             colors = ['x', 'y', 'x'],
+             title = 'Title',
+             data_font_size = 9).to_bytes('png')
+print(*[cache.cache_info().misses for cache in caches])
+"""
+
+
+def get_misses():
+    env = dict(os.environ, PYTHONPATH = ROOT)
+    result = subprocess.run([sys.executable, '-c', CODE],
+                            capture_output = True,
+                            text = True,
+                            env = env,
+                            check = True)
+    return [[int(x) for x in line.split()]
+            for line in result.stdout.splitlines()]
+
+
+class TestWarmup(unittest.TestCase):
+    def test_caches(self):
+        warm, first = get_misses()
+        # Fonts, font files and the mathtext parser are loaded.
+        for misses in warm:
+            self.assertGreater(misses, 0)
+        # The first chart finds its fonts in the caches.
+        self.assertEqual(first[:2], warm[:2])
+
+    def test_formats(self):
+        catbars.warmup({'dpi' : 50}, formats = ['png', 'pdf'])
+
+if __name__ == '__main__':
+    unittest.main()